@@ -1,6 +1,15 @@
+import itertools
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+import httpx
 import google.genai as genai
+from google.genai import errors as genai_errors
 from google.genai import types
 from k8s import client as k8s_client
+from k8s.resilience import RETRYABLE_STATUSES, CircuitBreaker, call, deadline, retry_after
+from k8s.tracing import LLM, tracer
+from history import ChatHistory
 
 SYSTEM_PROMPT = """
 You are MCP, an intelligent and versatile Kubernetes copilot. Your mission is to assist the user by using the tools at your disposal to answer questions and execute tasks.
@@ -18,44 +27,184 @@ def extract_text_from_response(response):
         return ''.join(part.text for part in response.candidates[0].content.parts if hasattr(part, 'text'))
     return ""
 
+# Timeout (s) of one Gemini request, and total budget of one model call including retries.
+LLM_TIMEOUT = float(os.getenv('MCP_LLM_TIMEOUT', '120'))
+LLM_DEADLINE = float(os.getenv('MCP_LLM_DEADLINE', '300'))
+
+# Shared by every agent of the process: Gemini is one dependency, whatever the session.
+llm_breaker = CircuitBreaker("Gemini")
+
+def create_genai_client():
+    return genai.Client(http_options=types.HttpOptions(timeout=int(LLM_TIMEOUT * 1000)))
+
+def llm_transient(e):
+    """Retry policy for Gemini calls: 429/5xx and network errors."""
+    if isinstance(e, genai_errors.APIError):
+        return retry_after(getattr(e.response, 'headers', None)) if e.code in RETRYABLE_STATUSES else None
+    if isinstance(e, httpx.TransportError):
+        return 0.0
+    return None
+
+def record_usage(span, usage):
+    """Copies the token counts of a response's usage_metadata onto a span."""
+    if usage:
+        span.set(prompt_tokens=usage.prompt_token_count, response_tokens=usage.candidates_token_count)
+
 class Agent:
     DANGEROUS_VERBS = {'restart', 'scale', 'undo', 'apply', 'delete', 'deploy'}
 
-    def __init__(self, model_name='gemini-2.5-pro'):
+    def __init__(self, model_name='gemini-2.5-pro', history_token_budget=None, max_tool_workers=None,
+                 client=None, tool_pool=None):
+        """`client` and `tool_pool` may be shared between agents (one per server session)."""
         try:
-            self.client = genai.Client()
+            self.client = client or create_genai_client()
         except Exception as e:
             raise RuntimeError(f"Impossible d'initialiser le client Google GenAI: {e}")
 
         self.model_name = model_name
         self.available_tools = [k8s_client.kubernetes_tool]
-        self.tool_config = types.GenerateContentConfig(tools=self.available_tools)
+        # The loop below runs the tools itself so dangerous verbs can be gated.
+        self.tool_config = types.GenerateContentConfig(
+            tools=self.available_tools,
+            automatic_function_calling=types.AutomaticFunctionCallingConfig(disable=True),
+        )
+        self._tool_pool = tool_pool or ThreadPoolExecutor(
+            max_workers=max_tool_workers or int(os.getenv('MCP_TOOL_WORKERS', '4')),
+            thread_name_prefix='mcp-tool',
+        )
 
-        self.chat_history = [
+        self.chat_history = ChatHistory(preamble=[
             types.Content(role="user", parts=[types.Part.from_text(text=SYSTEM_PROMPT)]),
             types.Content(role="model", parts=[types.Part.from_text(text="Understood. I am a versatile Kubernetes copilot. I will consult my tool's documentation for every task and always ask for confirmation for dangerous actions. I am ready.")])
-        ]
+        ], token_budget=history_token_budget)
         self.pending_action = None
+        self.tokens_saved = 0
 
-    def execute_turn(self, user_input: str) -> str:
-        if self.pending_action:
-            action_to_execute = self.pending_action
-            self.pending_action = None
-            if user_input.lower() not in ['oui', 'yes', 'y']:
-                return "Action annulée."
-
-            tool_result = k8s_client.kubernetes_tool(**action_to_execute)
-            self.chat_history.append(types.Content(role="model", parts=[
-                types.Part.from_function_response(name="kubernetes_tool", response={"result": tool_result})
-            ]))
-        else:
+    def remember(self, user_input: str, reply: str):
+        """Records an exchange answered without the model (fast path), so later turns can refer to it."""
+        self.chat_history.append(types.Content(role="user", parts=[types.Part.from_text(text=user_input)]))
+        self.chat_history.append(types.Content(role="model", parts=[types.Part.from_text(text=reply)]))
+
+    def _run_tools(self, actions, targets=None):
+        """Runs kubernetes_tool for each action concurrently; results keep the input order.
+
+        `targets` optionally pins, per action, the objects confirmed for a bulk action.
+        """
+        targets = targets or [None] * len(actions)
+        return list(self._tool_pool.map(tracer.bind(k8s_client.run_action), actions, targets))
+
+    @staticmethod
+    def _describe_action(action, targets):
+        target = action.get('application_name') or action.get('name')
+        if targets is not None:
+            target = f"{len(targets)} déploiement(s) ({action.get('label_selector')})"
+        cluster = f" (cluster {action['cluster']})" if action.get('cluster') else ""
+        return f"{action.get('verb')} {target}{cluster}"
+
+    @staticmethod
+    def _function_responses(function_calls, results):
+        return types.Content(role="model", parts=[
+            types.Part(function_response=types.FunctionResponse(
+                id=fc.id, name=fc.name or "kubernetes_tool", response={"result": result}
+            ))
+            for fc, result in zip(function_calls, results)
+        ])
+
+    def _begin_turn(self, user_input: str):
+        """Records the user input, or resolves a pending confirmation. Returns a message if the turn ends here."""
+        self.tokens_saved = 0
+        tracer.start_turn()
+        if not self.pending_action:
             self.chat_history.append(types.Content(role="user", parts=[types.Part.from_text(text=user_input)]))
+            return None
+
+        pending = self.pending_action
+        self.pending_action = None
+        confirmed = user_input.lower() in ['oui', 'yes', 'y']
+
+        results = pending['results']
+        dangerous = pending['dangerous']
+        if confirmed:
+            outcomes = self._run_tools([pending['actions'][i] for i in dangerous],
+                                       [pending['targets'].get(i) for i in dangerous])
+        else:
+            outcomes = ["Action annulée par l'utilisateur."] * len(dangerous)
+        for i, outcome in zip(dangerous, outcomes):
+            results[i] = outcome
+        self.chat_history.append(self._function_responses(pending['function_calls'], results))
+
+        return None if confirmed else "Action annulée."
+
+    def _handle_function_calls(self, content, function_calls):
+        """Runs the safe calls and records their responses. Returns a confirmation prompt if any call is dangerous."""
+        self.chat_history.append(content)
+        actions = [dict(fc.args) if fc.args else {} for fc in function_calls]
+        dangerous = [i for i, action in enumerate(actions) if action.get('verb') in self.DANGEROUS_VERBS]
+        safe = [i for i in range(len(actions)) if i not in dangerous]
+
+        results = [None] * len(actions)
+        for i, result in zip(safe, self._run_tools([actions[i] for i in safe])):
+            results[i] = result
+
+        # Bulk actions are resolved now so the user confirms the exact objects touched.
+        targets = {}
+        for i in [i for i in dangerous if k8s_client.is_bulk(actions[i])]:
+            selector = actions[i]['label_selector']
+            try:
+                resolved = k8s_client.bulk_targets(actions[i])
+            except Exception as e:
+                resolved, results[i] = [], f"Erreur: Impossible de résoudre le label_selector '{selector}': {e}"
+            if resolved:
+                targets[i] = resolved
+            else:
+                results[i] = results[i] or f"Aucun déploiement ne correspond au label_selector '{selector}'."
+                dangerous.remove(i)
+
+        if dangerous:
+            self.pending_action = {
+                'function_calls': function_calls, 'actions': actions,
+                'results': results, 'dangerous': dangerous, 'targets': targets,
+            }
+            summary = ", ".join(self._describe_action(actions[i], targets.get(i)) for i in dangerous)
+            listing = ""
+            for i in [i for i in dangerous if i in targets]:
+                if len(dangerous) > 1:
+                    listing += f"\n  {self._describe_action(actions[i], targets[i])}:"
+                listing += "".join(f"\n  - {namespace}/{name}" for namespace, name in targets[i])
+            subject = "l'action" if len(dangerous) == 1 else f"les {len(dangerous)} actions"
+            question = f"Confirmez-vous {subject} : {summary} ?"
+            return f"{question}{listing}\n(oui/non)" if listing else f"{question} (oui/non)"
+
+        self.chat_history.append(self._function_responses(function_calls, results))
+        return None
+
+    @staticmethod
+    def _call_model(request):
+        """Runs one model request under LLM_DEADLINE, with retries and the shared breaker."""
+        with deadline(LLM_DEADLINE):
+            return call(request, llm_transient, llm_breaker)
+
+    def _open_stream(self):
+        """Starts a streamed response; errors surface on the first chunk, so it is read here to be retryable."""
+        stream = iter(self.client.models.generate_content_stream(
+            model=self.model_name, contents=self.chat_history.contents, config=self.tool_config
+        ))
+        first = next(stream, None)
+        return stream if first is None else itertools.chain([first], stream)
+
+    def execute_turn(self, user_input: str) -> str:
+        message = self._begin_turn(user_input)
+        if message:
+            return message
 
         try:
             while True:
-                response = self.client.models.generate_content(
-                    model=self.model_name, contents=self.chat_history, config=self.tool_config
-                )
+                self.tokens_saved += self.chat_history.compact()
+                with tracer.span(LLM, self.model_name, history_tokens=self.chat_history.token_count()) as span:
+                    response = self._call_model(lambda: self.client.models.generate_content(
+                        model=self.model_name, contents=self.chat_history.contents, config=self.tool_config
+                    ))
+                    record_usage(span, getattr(response, 'usage_metadata', None))
 
                 if not response.candidates: return "Le modèle n'a pas fourni de réponse valide."
                 candidate = response.candidates[0]
@@ -63,25 +212,64 @@ class Agent:
                     if candidate.content: self.chat_history.append(candidate.content)
                     return "Action terminée."
 
-                part = candidate.content.parts[0]
-                fc = getattr(part, 'function_call', None)
-
-                if fc:
-                    self.chat_history.append(candidate.content)
-                    action_details = {k: v for k, v in fc.args.items()} if fc.args else {}
+                function_calls = [part.function_call for part in candidate.content.parts if part.function_call]
 
-                    if action_details.get('verb') in self.DANGEROUS_VERBS:
-                        self.pending_action = action_details
-                        resource_name = action_details.get('application_name') or action_details.get('name')
-                        return f"Confirmez-vous l'action : {action_details.get('verb')} {resource_name} ? (oui/non)"
-
-                    tool_result = k8s_client.kubernetes_tool(**action_details)
-                    self.chat_history.append(types.Content(role="model", parts=[
-                        types.Part.from_function_response(name="kubernetes_tool", response={"result": tool_result})
-                    ]))
+                if function_calls:
+                    confirmation = self._handle_function_calls(candidate.content, function_calls)
+                    if confirmation:
+                        return confirmation
                 else:
                     response_text = extract_text_from_response(response)
                     self.chat_history.append(candidate.content)
                     return response_text
         except Exception as e:
             return f"Une erreur inattendue est survenue: {e}"
+
+    def stream_turn(self, user_input: str):
+        """Streaming variant of `execute_turn`.
+
+        Yields `(kind, payload)` events as they arrive: `('text', chunk)` for model
+        text and confirmation prompts, `('tool_call', action)` before tools run.
+        """
+        message = self._begin_turn(user_input)
+        if message:
+            yield 'text', message
+            return
+
+        try:
+            while True:
+                self.tokens_saved += self.chat_history.compact()
+                with tracer.span(LLM, self.model_name, history_tokens=self.chat_history.token_count()) as span:
+                    stream = self._call_model(self._open_stream)
+
+                    parts = []
+                    for chunk in stream:
+                        if 'first_chunk_ms' not in span.attrs:
+                            span.set(first_chunk_ms=round((time.time() - span.start) * 1000, 1))
+                        record_usage(span, chunk.usage_metadata)
+                        if not chunk.candidates or not chunk.candidates[0].content:
+                            continue
+                        for part in chunk.candidates[0].content.parts or []:
+                            parts.append(part)
+                            if part.text and not part.thought:
+                                yield 'text', part.text
+
+                if not parts:
+                    yield 'text', "Action terminée."
+                    return
+
+                content = types.Content(role="model", parts=parts)
+                function_calls = [part.function_call for part in parts if part.function_call]
+
+                if function_calls:
+                    for fc in function_calls:
+                        yield 'tool_call', dict(fc.args) if fc.args else {}
+                    confirmation = self._handle_function_calls(content, function_calls)
+                    if confirmation:
+                        yield 'text', confirmation
+                        return
+                else:
+                    self.chat_history.append(content)
+                    return
+        except Exception as e:
+            yield 'text', f"Une erreur inattendue est survenue: {e}"
@@ -0,0 +1,50 @@
+"""Compares typed-model deserialization with the raw-JSON fast path on a large pod list.
+
+Usage: python -m benchmarks.bench_fastread [pod_count]
+"""
+import json
+import sys
+import time
+from types import SimpleNamespace
+
+from kubernetes import client
+
+from k8s.fastread import RawObject
+from k8s.handlers.pod_handler import _pod_line
+from benchmarks.fixtures import pod_list
+
+
+def _typed(payload):
+    pods = client.ApiClient().deserialize(SimpleNamespace(data=payload), 'V1PodList')
+    return "".join(_pod_line(item) for item in pods.items)
+
+
+def _raw(payload):
+    pods = RawObject(json.loads(payload))
+    return "".join(_pod_line(item) for item in pods.items)
+
+
+def _best_of(func, payload, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = func(payload)
+        best = min(best, time.perf_counter() - start)
+    return best, output
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    payload = json.dumps(pod_list(count))
+    print(f"{count} pods, payload {len(payload) / 1e6:.1f} MB")
+
+    typed_time, typed_output = _best_of(_typed, payload, repeat=3)
+    raw_time, raw_output = _best_of(_raw, payload, repeat=3)
+    assert typed_output == raw_output, "fast path output differs from typed path"
+
+    print(f"typed models : {typed_time * 1000:8.1f} ms")
+    print(f"raw JSON     : {raw_time * 1000:8.1f} ms  (x{typed_time / raw_time:.1f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+"""Drives every HANDLER_REGISTRY entry through kubernetes_tool against the fake apiserver.
+
+For each cluster size, reports per handler the latency percentiles, bytes and
+requests sent by the apiserver per call, the peak Python allocation during a
+call and the process RSS high-water mark. A scripted LLM replays function
+calls through Agent.execute_turn to measure the agent loop's own overhead
+without network access. Results are written as JSON; pass --compare with an
+earlier file to see the change per handler.
+
+Usage: python -m benchmarks.bench_handlers [--sizes 1000,10000,100000] [--iterations 10]
+       [--informers] [--output bench_results.json] [--compare previous.json]
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import urllib.request
+from types import SimpleNamespace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SAMPLE_POD = {'name': 'app-1-000001', 'namespace': 'ns-1'}
+SAMPLE_DEPLOYMENT = {'name': 'app-1', 'namespace': 'ns-1'}
+MANIFEST = """
+apiVersion: v1
+kind: Namespace
+metadata:
+  name: bench
+---
+apiVersion: v1
+kind: ConfigMap
+metadata:
+  name: bench-config
+  namespace: bench
+data:
+  key: value
+---
+apiVersion: apps/v1
+kind: Deployment
+metadata:
+  name: bench-web
+  namespace: bench
+spec:
+  replicas: 1
+  selector:
+    matchLabels: {app: bench-web}
+  template:
+    metadata:
+      labels: {app: bench-web}
+    spec:
+      containers:
+      - name: web
+        image: nginx
+"""
+
+# kubernetes_tool arguments for each registry entry; entries without one are reported as skipped.
+SCENARIOS = {
+    ('get', 'nodes'): {},
+    ('get', 'namespaces'): {},
+    ('get', 'pods'): {},
+    ('get', 'deployments'): {},
+    ('describe', 'pods'): SAMPLE_POD,
+    ('describe', 'deployments'): SAMPLE_DEPLOYMENT,
+    ('history', 'deployments'): SAMPLE_DEPLOYMENT,
+    ('undo', 'deployments'): SAMPLE_DEPLOYMENT,
+    ('restart', 'deployments'): SAMPLE_DEPLOYMENT,
+    ('scale', 'deployments'): dict(SAMPLE_DEPLOYMENT, replicas=3),
+    ('logs', 'pods'): SAMPLE_POD,
+    ('logs', 'deployments'): dict(SAMPLE_DEPLOYMENT, tail_lines=20),
+    ('check', 'health'): {},
+    ('deploy', 'application'): {'application_name': 'bench', 'image': 'nginx'},
+    ('apply', 'manifest'): {'manifest': MANIFEST},
+}
+
+# The scripted model asks for these in one response, then answers with text.
+AGENT_CALLS = [
+    {'verb': 'get', 'resource': 'pods', 'namespace': 'ns-1'},
+    {'verb': 'get', 'resource': 'deployments'},
+    {'verb': 'check', 'resource': 'health'},
+]
+
+KUBECONFIG_TEMPLATE = """apiVersion: v1
+kind: Config
+current-context: {context}
+clusters:
+- name: {context}
+  cluster: {{server: "{url}"}}
+contexts:
+- name: {context}
+  context: {{cluster: {context}, user: bench}}
+users:
+- name: bench
+  user: {{token: bench}}
+"""
+
+
+def _percentiles(samples):
+    ordered = sorted(samples)
+
+    def pick(q):
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000
+
+    return {
+        'p50_ms': round(pick(0.50), 3), 'p90_ms': round(pick(0.90), 3), 'p99_ms': round(pick(0.99), 3),
+        'mean_ms': round(statistics.mean(samples) * 1000, 3), 'max_ms': round(ordered[-1] * 1000, 3),
+    }
+
+
+def _server_stats(url):
+    with urllib.request.urlopen(f"{url}/_stats") as resp:
+        return json.load(resp)
+
+
+def _start_server(pods):
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.fake_apiserver", "--pods", str(pods)],
+        cwd=ROOT, stdout=subprocess.PIPE, text=True,
+    )
+    return proc, proc.stdout.readline().strip()
+
+
+def _is_error(result):
+    return result.startswith(("Erreur", "Une erreur", "Error"))
+
+
+def bench_handler(tool, url, cluster, args, iterations):
+    before = _server_stats(url)
+    samples, result = [], ""
+    for _ in range(iterations):
+        start = time.perf_counter()
+        result = tool(cluster=cluster, **args)
+        samples.append(time.perf_counter() - start)
+    after = _server_stats(url)
+
+    tracemalloc.start()
+    tool(cluster=cluster, **args)
+    _, peak_alloc = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    stats = _percentiles(samples)
+    stats.update(
+        bytes_per_call=(after['bytes_sent'] - before['bytes_sent']) // iterations,
+        requests_per_call=(after['requests'] - before['requests']) / iterations,
+        peak_alloc_bytes=peak_alloc,
+        max_rss_kb=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        output_chars=len(result),
+    )
+    if _is_error(result):
+        stats['error'] = result[:300]
+    return stats
+
+
+class ScriptedModels:
+    """Stands in for client.models: replays a function-call response, then a text answer."""
+
+    def __init__(self, cluster):
+        from google.genai import types
+        self._types = types
+        self._cluster = cluster
+        self._step = 0
+
+    def _response(self, parts):
+        content = self._types.Content(role="model", parts=parts)
+        return SimpleNamespace(candidates=[SimpleNamespace(content=content)])
+
+    def generate_content(self, model, contents, config):
+        types = self._types
+        self._step += 1
+        if self._step % 2:
+            return self._response([
+                types.Part(function_call=types.FunctionCall(id=str(i), name="kubernetes_tool", args=dict(call, cluster=self._cluster)))
+                for i, call in enumerate(AGENT_CALLS)
+            ])
+        return self._response([types.Part.from_text(text="Rapport terminé.")])
+
+
+def bench_agent(cluster, iterations):
+    os.environ.setdefault('GOOGLE_API_KEY', 'bench')
+    from agent import Agent
+
+    agent = Agent()
+    agent.client = SimpleNamespace(models=ScriptedModels(cluster))
+    tool_time = [0.0]
+    run_tools = agent._run_tools
+
+    def timed_run_tools(actions, targets=None):
+        start = time.perf_counter()
+        try:
+            return run_tools(actions, targets)
+        finally:
+            tool_time[0] += time.perf_counter() - start
+
+    agent._run_tools = timed_run_tools
+    turns, overheads = [], []
+    for _ in range(iterations):
+        tool_time[0] = 0.0
+        start = time.perf_counter()
+        agent.execute_turn("fais-moi un rapport complet")
+        elapsed = time.perf_counter() - start
+        turns.append(elapsed)
+        overheads.append(elapsed - tool_time[0])
+    return {'turn': _percentiles(turns), 'overhead': _percentiles(overheads)}
+
+
+def run(sizes, iterations, informers):
+    os.environ['MCP_RESULT_CACHE'] = '0'
+    os.environ['MCP_INFORMERS'] = '1' if informers else '0'
+    kubeconfig = tempfile.NamedTemporaryFile('w', suffix='.yaml', delete=False)
+    os.environ['KUBECONFIG'] = kubeconfig.name
+    sys.path.insert(0, ROOT)
+    from k8s.client import kubernetes_tool
+    from k8s.router import HANDLER_REGISTRY
+
+    results = {}
+    for size in sizes:
+        proc, url = _start_server(size)
+        cluster = f"bench-{size}"
+        with open(kubeconfig.name, 'w') as f:
+            f.write(KUBECONFIG_TEMPLATE.format(context=cluster, url=url))
+        try:
+            handlers = {}
+            for verb, resource_name in sorted(HANDLER_REGISTRY):
+                label = f"{verb} {resource_name}"
+                args = SCENARIOS.get((verb, resource_name))
+                if args is None:
+                    handlers[label] = {'skipped': 'no scenario'}
+                    continue
+                tool = lambda cluster, verb=verb, resource_name=resource_name, **kw: kubernetes_tool(verb, resource_name, cluster=cluster, **kw)
+                handlers[label] = bench_handler(tool, url, cluster, args, iterations)
+                print(f"[{size}] {label:<24} p50 {handlers[label].get('p50_ms', 0):9.2f} ms"
+                      f"  {handlers[label].get('bytes_per_call', 0) / 1e3:10.1f} kB/call"
+                      f"{'  ERROR' if 'error' in handlers[label] else ''}", flush=True)
+            agent = bench_agent(cluster, iterations)
+            print(f"[{size}] agent turn p50 {agent['turn']['p50_ms']:.2f} ms, overhead p50 {agent['overhead']['p50_ms']:.2f} ms")
+            results[str(size)] = {'handlers': handlers, 'agent': agent}
+        finally:
+            proc.terminate()
+            proc.wait()
+    os.unlink(kubeconfig.name)
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, text=True).strip()
+    except Exception:
+        return None
+
+
+def compare(previous, current):
+    for size, data in current['results'].items():
+        old = previous.get('results', {}).get(size)
+        if not old:
+            continue
+        print(f"\n{size} objects vs {previous['meta'].get('commit')}:")
+        for label, stats in data['handlers'].items():
+            before = old['handlers'].get(label, {}).get('p50_ms')
+            if before and 'p50_ms' in stats:
+                print(f"  {label:<24} {before:9.2f} -> {stats['p50_ms']:9.2f} ms ({(stats['p50_ms'] / before - 1) * 100:+.0f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Handler benchmarks against a fake apiserver")
+    parser.add_argument('--sizes', default='1000,10000', help="comma-separated pod counts (e.g. 1000,10000,100000)")
+    parser.add_argument('--iterations', type=int, default=10)
+    parser.add_argument('--informers', action='store_true', help="serve reads from informers instead of direct API calls")
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--compare', help="earlier results file to compare against")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+    report = {
+        'meta': {
+            'commit': _git_commit(), 'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(), 'iterations': args.iterations, 'informers': args.informers,
+        },
+        'results': run(sizes, args.iterations, args.informers),
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nRésultats écrits dans {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main()
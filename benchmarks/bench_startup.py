@@ -0,0 +1,50 @@
+"""Measures cold start of the REPL: process launch until the `MCP>` prompt is shown.
+
+Usage: python -m benchmarks.bench_startup [--runs N] [--budget SECONDS]
+Exits with status 1 when the median exceeds the budget.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROMPT = b"MCP> "
+DEFAULT_BUDGET = 0.5
+
+
+def time_to_prompt():
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "mcp_core.py"], cwd=ROOT,
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+    )
+    seen = b""
+    while PROMPT not in seen:
+        chunk = proc.stdout.read1(4096)
+        if not chunk:
+            raise RuntimeError("REPL exited before showing its prompt")
+        seen += chunk
+    elapsed = time.perf_counter() - start
+    proc.communicate(b"exit\n", timeout=30)
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET, help="regression budget for the median, in seconds")
+    args = parser.parse_args()
+
+    samples = [time_to_prompt() for _ in range(args.runs)]
+    median = statistics.median(samples)
+    print(f"time to prompt: median {median * 1000:.0f} ms, min {min(samples) * 1000:.0f} ms, max {max(samples) * 1000:.0f} ms")
+    if median > args.budget:
+        print(f"REGRESSION: median above the {args.budget * 1000:.0f} ms budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""A stand-in Kubernetes API server serving synthetic objects over plain HTTP.
+
+Covers the endpoints the handlers use: collection lists with limit/continue
+and label/field selectors, single-object reads, pod logs, deployment
+patches, creates, discovery for the dynamic client, and watches (which stay
+idle until their timeout). Every object is serialized once at startup, so
+serving cost is dominated by I/O, not by the fake itself.
+
+Usage: python -m benchmarks.fake_apiserver --pods 10000 [--port 0]
+GET /_stats returns the bytes and requests served so far.
+"""
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks.fixtures import (
+    APPS, synthetic_deployment, synthetic_namespace, synthetic_node, synthetic_pod, synthetic_replicaset,
+)
+from k8s.selectors import field_matcher, label_matcher
+
+NAMESPACES = 20
+REVISIONS = 3
+
+CORE_RESOURCES = [
+    ("pods", "Pod", True), ("pods/log", "Pod", True), ("nodes", "Node", False),
+    ("namespaces", "Namespace", False), ("configmaps", "ConfigMap", True), ("services", "Service", True),
+    ("secrets", "Secret", True),
+]
+APPS_RESOURCES = [
+    ("deployments", "Deployment", True), ("deployments/scale", "Scale", True),
+    ("replicasets", "ReplicaSet", True), ("statefulsets", "StatefulSet", True), ("daemonsets", "DaemonSet", True),
+]
+
+_PATH = re.compile(
+    r"^/(?:api/v1|apis/apps/v1)(?:/namespaces/(?P<ns>[^/]+))?/(?P<resource>[a-z]+)(?:/(?P<name>[^/]+))?(?:/(?P<sub>[a-z]+))?$"
+)
+
+
+class _Entry:
+    """One stored object: its JSON bytes plus the few fields selectors look at."""
+
+    __slots__ = ("raw", "view")
+
+    def __init__(self, obj):
+        self.raw = json.dumps(obj, separators=(",", ":")).encode()
+        metadata = obj["metadata"]
+        self.view = SimpleNamespace(
+            metadata=SimpleNamespace(name=metadata["name"], namespace=metadata.get("namespace"),
+                                     labels=metadata.get("labels") or {}),
+            status=SimpleNamespace(phase=obj.get("status", {}).get("phase")),
+            spec=SimpleNamespace(node_name=obj.get("spec", {}).get("nodeName")),
+        )
+
+
+class Store:
+    def __init__(self, pods):
+        deployments = max(min(APPS, pods // 4), 1)
+        nodes = max(pods // 100, 3)
+        self.resource_version = 10 * pods
+        self.objects = {
+            "pods": [_Entry(synthetic_pod(i, NAMESPACES, deployments, nodes)) for i in range(pods)],
+            "deployments": [_Entry(synthetic_deployment(k, NAMESPACES)) for k in range(deployments)],
+            "replicasets": [
+                _Entry(synthetic_replicaset(k, r, NAMESPACES)) for k in range(deployments) for r in range(1, REVISIONS + 1)
+            ],
+            "nodes": [_Entry(synthetic_node(n)) for n in range(nodes)],
+            "namespaces": [_Entry(synthetic_namespace(n)) for n in range(NAMESPACES)],
+        }
+        self.by_name = {
+            (resource, e.view.metadata.namespace, e.view.metadata.name): e
+            for resource, entries in self.objects.items() for e in entries
+        }
+        self.bytes_sent = 0
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    def page(self, resource, namespace, query):
+        entries = self.objects.get(resource, [])
+        matches = [label_matcher(query.get("labelSelector")), field_matcher(query.get("fieldSelector"))]
+        start = int(query.get("continue") or 0)
+        limit = int(query.get("limit") or 0) or len(entries)
+        items, position = [], start
+        while position < len(entries) and len(items) < limit:
+            entry = entries[position]
+            position += 1
+            if namespace and entry.view.metadata.namespace != namespace:
+                continue
+            if all(match(entry.view) for match in matches):
+                items.append(entry.raw)
+        metadata = {"resourceVersion": str(self.resource_version)}
+        if position < len(entries):
+            metadata["continue"] = str(position)
+        return b'{"kind":"List","apiVersion":"v1","metadata":' + json.dumps(metadata).encode() + \
+            b',"items":[' + b",".join(items) + b"]}"
+
+
+def _discovery(path):
+    if path == "/version":
+        return {"major": "1", "minor": "33", "gitVersion": "v1.33.0-fake"}
+    if path == "/api":
+        return {"kind": "APIVersions", "versions": ["v1"]}
+    if path == "/apis":
+        version = {"groupVersion": "apps/v1", "version": "v1"}
+        return {"kind": "APIGroupList", "groups": [{"name": "apps", "versions": [version], "preferredVersion": version}]}
+    if path in ("/api/v1", "/apis/apps/v1"):
+        resources = CORE_RESOURCES if path == "/api/v1" else APPS_RESOURCES
+        return {
+            "kind": "APIResourceList", "groupVersion": path.split("/", 2)[2],
+            "resources": [
+                {"name": name, "singularName": "", "namespaced": namespaced, "kind": kind,
+                 "verbs": ["create", "get", "list", "patch", "update", "watch", "delete"]}
+                for name, kind, namespaced in resources
+            ],
+        }
+    return None
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    store: Store = None
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body, content_type="application/json", counted=True):
+        if not isinstance(body, bytes):
+            body = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        if counted:
+            with self.store.lock:
+                self.store.bytes_sent += len(body)
+                self.store.requests += 1
+
+    def _not_found(self):
+        self._send(404, {"kind": "Status", "status": "Failure", "reason": "NotFound", "code": 404})
+
+    def _read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def _watch(self, query):
+        # Idle watch: no events, closed at the requested timeout.
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        time.sleep(min(float(query.get("timeoutSeconds") or 1), 5))
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        if url.path == "/_stats":
+            stats = {"bytes_sent": self.store.bytes_sent, "requests": self.store.requests}
+            return self._send(200, stats, counted=False)
+        discovery = _discovery(url.path)
+        if discovery is not None:
+            return self._send(200, discovery)
+
+        m = _PATH.match(url.path)
+        if not m:
+            return self._not_found()
+        ns, resource, name, sub = m.group("ns", "resource", "name", "sub")
+        if query.get("watch") in ("true", "1", "True"):
+            return self._watch(query)
+        if name is None:
+            return self._send(200, self.store.page(resource, ns, query))
+
+        entry = self.store.by_name.get((resource, ns, name))
+        if entry is None:
+            return self._not_found()
+        if sub == "log":
+            lines = int(query.get("tailLines") or 100)
+            text = "".join(f"2025-01-01T00:00:{i % 60:02d}Z {'ERROR' if i % 10 == 0 else 'INFO'} request {i} served\n"
+                           for i in range(lines))
+            return self._send(200, text.encode(), "text/plain")
+        return self._send(200, entry.raw)
+
+    def do_PATCH(self):
+        url = urlparse(self.path)
+        body = self._read_body()
+        m = _PATH.match(url.path)
+        if not m:
+            return self._not_found()
+        ns, resource, name, sub = m.group("ns", "resource", "name", "sub")
+        entry = self.store.by_name.get((resource, ns, name))
+        if sub == "scale":
+            replicas = body.get("spec", {}).get("replicas", 1)
+            return self._send(200, {"kind": "Scale", "apiVersion": "autoscaling/v1",
+                                    "metadata": {"name": name, "namespace": ns}, "spec": {"replicas": replicas}})
+        if entry is not None:
+            return self._send(200, entry.raw)
+        # Server-side apply creates what does not exist yet.
+        body.setdefault("metadata", {}).setdefault("namespace", ns)
+        return self._send(201, body)
+
+    def do_POST(self):
+        body = self._read_body()
+        return self._send(201, body)
+
+
+def serve(pods, port=0):
+    """Starts the fake apiserver in a background thread; returns the server (see `server_address`)."""
+    Handler.store = Store(pods)
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake Kubernetes API server with synthetic objects")
+    parser.add_argument("--pods", type=int, default=1000)
+    parser.add_argument("--port", type=int, default=0)
+    args = parser.parse_args()
+
+    server = serve(args.pods, args.port)
+    print(f"http://127.0.0.1:{server.server_address[1]}", flush=True)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""Synthetic Kubernetes objects shaped like real apiserver JSON."""
+
+PHASES = ['Running'] * 17 + ['Pending', 'Failed', 'Succeeded']
+
+
+APPS = 250
+
+
+def synthetic_pod(i, namespaces=20, apps=APPS, nodes=50):
+    app_index = i % apps
+    ns = f"ns-{app_index % namespaces}"
+    app = f"app-{app_index}"
+    ready = i % 23 != 0
+    return {
+        "apiVersion": "v1",
+        "kind": "Pod",
+        "metadata": {
+            "name": f"{app}-{i:06d}",
+            "namespace": ns,
+            "uid": f"pod-uid-{i}",
+            "resourceVersion": str(1000 + i),
+            "creationTimestamp": "2025-01-01T00:00:00Z",
+            "labels": {"app": app, "tier": "backend" if i % 2 else "frontend", "pod-template-hash": "5d9c8f7b6"},
+            "annotations": {"kubectl.kubernetes.io/restartedAt": "2025-01-01T00:00:00Z"},
+            "ownerReferences": [{
+                "apiVersion": "apps/v1", "kind": "ReplicaSet", "name": f"{app}-5d9c8f7b6",
+                "uid": f"rs-uid-{app_index}", "controller": True, "blockOwnerDeletion": True,
+            }],
+        },
+        "spec": {
+            "nodeName": f"node-{i % nodes}",
+            "serviceAccountName": "default",
+            "containers": [{
+                "name": name,
+                "image": f"registry.example.com/{app}/{name}:1.{i % 7}",
+                "ports": [{"containerPort": 8080, "protocol": "TCP"}],
+                "env": [{"name": f"VAR_{k}", "value": str(k)} for k in range(5)],
+                "resources": {"requests": {"cpu": "100m", "memory": "128Mi"}, "limits": {"cpu": "500m", "memory": "256Mi"}},
+                "volumeMounts": [{"name": "config", "mountPath": "/etc/config"}],
+            } for name in ("main", "sidecar")],
+            "volumes": [{"name": "config", "configMap": {"name": f"{app}-config"}}],
+        },
+        "status": {
+            "phase": PHASES[i % len(PHASES)],
+            "podIP": f"10.{(i >> 16) & 255}.{(i >> 8) & 255}.{i & 255}",
+            "hostIP": f"192.168.{(i % nodes) >> 8}.{(i % nodes) & 255}",
+            "startTime": "2025-01-01T00:00:00Z",
+            "conditions": [
+                {"type": t, "status": "True", "lastTransitionTime": "2025-01-01T00:00:00Z"}
+                for t in ("Initialized", "Ready", "ContainersReady", "PodScheduled")
+            ],
+            "containerStatuses": [{
+                "name": name,
+                "ready": ready,
+                "restartCount": i % 13,
+                "image": f"registry.example.com/{app}/{name}:1.{i % 7}",
+                "imageID": "sha256:0123456789abcdef",
+                "containerID": f"containerd://{i:064d}",
+                "started": True,
+                "state": {"running": {"startedAt": "2025-01-01T00:00:00Z"}},
+            } for name in ("main", "sidecar")],
+        },
+    }
+
+
+def pod_list(count):
+    return {
+        "apiVersion": "v1",
+        "kind": "PodList",
+        "metadata": {"resourceVersion": str(1000 + count)},
+        "items": [synthetic_pod(i) for i in range(count)],
+    }
+
+
+def _template(app):
+    return {
+        "metadata": {"labels": {"app": app}},
+        "spec": {"containers": [{"name": "main", "image": f"registry.example.com/{app}/main:1.0"}]},
+    }
+
+
+def synthetic_deployment(k, namespaces=20, replicas=4):
+    app = f"app-{k}"
+    available = replicas if k % 17 else replicas - 1
+    return {
+        "apiVersion": "apps/v1",
+        "kind": "Deployment",
+        "metadata": {
+            "name": app, "namespace": f"ns-{k % namespaces}", "uid": f"dep-uid-{k}",
+            "resourceVersion": str(500 + k), "generation": 3, "labels": {"app": app},
+        },
+        "spec": {
+            "replicas": replicas,
+            "selector": {"matchLabels": {"app": app}},
+            "template": _template(app),
+        },
+        "status": {
+            "observedGeneration": 3, "replicas": replicas, "updatedReplicas": replicas,
+            "readyReplicas": available, "availableReplicas": available,
+        },
+    }
+
+
+def synthetic_replicaset(k, revision, namespaces=20):
+    app = f"app-{k}"
+    return {
+        "apiVersion": "apps/v1",
+        "kind": "ReplicaSet",
+        "metadata": {
+            "name": f"{app}-rev{revision}", "namespace": f"ns-{k % namespaces}",
+            "uid": f"rs-uid-{k}-{revision}", "resourceVersion": str(700 + k * 3 + revision),
+            "labels": {"app": app},
+            "annotations": {
+                "deployment.kubernetes.io/revision": str(revision),
+                "kubernetes.io/change-cause": f"image bump {revision}",
+            },
+            "ownerReferences": [{
+                "apiVersion": "apps/v1", "kind": "Deployment", "name": app,
+                "uid": f"dep-uid-{k}", "controller": True,
+            }],
+        },
+        "spec": {"replicas": 0, "selector": {"matchLabels": {"app": app}}, "template": _template(app)},
+        "status": {"replicas": 0},
+    }
+
+
+def synthetic_node(n):
+    return {
+        "apiVersion": "v1",
+        "kind": "Node",
+        "metadata": {"name": f"node-{n}", "uid": f"node-uid-{n}", "resourceVersion": str(100 + n), "labels": {}},
+        "status": {
+            "conditions": [{"type": "Ready", "status": "False" if n % 29 == 28 else "True"}],
+            "capacity": {"cpu": "16", "memory": "64Gi", "pods": "110"},
+        },
+    }
+
+
+def synthetic_namespace(n):
+    return {
+        "apiVersion": "v1",
+        "kind": "Namespace",
+        "metadata": {"name": f"ns-{n}", "uid": f"ns-uid-{n}", "resourceVersion": str(10 + n)},
+        "status": {"phase": "Active"},
+    }
@@ -0,0 +1,94 @@
+import json
+import os
+from google.genai import types
+
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(content) -> int:
+    """Rough token count of a Content (~4 characters per token), without an API round-trip."""
+    chars = 0
+    for part in content.parts or []:
+        if part.text:
+            chars += len(part.text)
+        if part.function_call:
+            chars += len(part.function_call.name or '') + len(json.dumps(part.function_call.args or {}, default=str))
+        if part.function_response:
+            chars += len(json.dumps(part.function_response.response or {}, default=str))
+    return chars // CHARS_PER_TOKEN + 1
+
+
+def _summarize_result(result, max_chars) -> str:
+    text = str(result)
+    if len(text) <= max_chars:
+        return text
+    lines = text.splitlines()
+    return f"{lines[0][:max_chars]} [... {len(lines)} lignes, {len(text)} caractères, résultat compacté]"
+
+
+class ChatHistory:
+    """Conversation sent to the model, kept under a token budget.
+
+    The preamble (system prompt) and the last `keep_recent_turns` turns are
+    kept verbatim. Older function responses are first shrunk to one-line stubs,
+    then, if still over budget, the oldest turns are dropped whole so that
+    function calls and their responses are never separated.
+    """
+
+    def __init__(self, preamble, token_budget=None, keep_recent_turns=4, stub_chars=160):
+        self.preamble = list(preamble)
+        self.turns = []
+        self.token_budget = token_budget or int(os.getenv('MCP_HISTORY_TOKEN_BUDGET', '32000'))
+        self.keep_recent_turns = keep_recent_turns
+        self.stub_chars = stub_chars
+        self.last_saved_tokens = 0
+        self.total_saved_tokens = 0
+
+    def append(self, content):
+        # A user text message starts a new turn; everything else belongs to the current one.
+        starts_turn = content.role == 'user' and any(part.text for part in content.parts or [])
+        if starts_turn or not self.turns:
+            self.turns.append([])
+        self.turns[-1].append(content)
+
+    @property
+    def contents(self):
+        return self.preamble + [content for turn in self.turns for content in turn]
+
+    def token_count(self) -> int:
+        return sum(estimate_tokens(content) for content in self.contents)
+
+    def compact(self) -> int:
+        """Brings the history under budget and returns the number of tokens saved."""
+        before = self.token_count()
+        tokens = before
+        old_turns = max(len(self.turns) - self.keep_recent_turns, 0)
+
+        for i in range(old_turns):
+            if tokens <= self.token_budget:
+                break
+            turn_before = sum(estimate_tokens(content) for content in self.turns[i])
+            self.turns[i] = [self._stub(content) for content in self.turns[i]]
+            tokens -= turn_before - sum(estimate_tokens(content) for content in self.turns[i])
+
+        while tokens > self.token_budget and old_turns > 0:
+            tokens -= sum(estimate_tokens(content) for content in self.turns.pop(0))
+            old_turns -= 1
+
+        self.last_saved_tokens = before - tokens
+        self.total_saved_tokens += self.last_saved_tokens
+        return self.last_saved_tokens
+
+    def _stub(self, content):
+        if not any(part.function_response for part in content.parts or []):
+            return content
+        parts = []
+        for part in content.parts:
+            fr = part.function_response
+            if fr:
+                result = (fr.response or {}).get('result', fr.response)
+                part = types.Part(function_response=types.FunctionResponse(
+                    id=fr.id, name=fr.name, response={"result": _summarize_result(result, self.stub_chars)}
+                ))
+            parts.append(part)
+        return types.Content(role=content.role, parts=parts)
@@ -0,0 +1,233 @@
+"""Local fast path: answers simple read commands without the LLM.
+
+A command is routed only if every word is explained by the grammar below
+(a verb, a resource, slot values such as a namespace, or filler words) and the
+resulting (verb, resource) is a read handler of HANDLER_REGISTRY whose
+required arguments are all known. Anything else goes to the agent.
+"""
+import inspect
+import os
+import re
+import threading
+import unicodedata
+from collections import Counter, deque
+from typing import NamedTuple, Optional
+
+from k8s import client as k8s_client
+from k8s.config import k8s_clients
+from k8s.router import HANDLER_REGISTRY, READ_VERBS
+from k8s.tracing import tracer
+
+ENABLED = os.getenv('MCP_FAST_PATH', '1') != '0'
+
+VERB_WORDS = {
+    'get': {'liste', 'lister', 'list', 'affiche', 'afficher', 'montre', 'montrer', 'show', 'get', 'donne',
+            'voir', 'see', 'quels', 'quelles', 'quel', 'quelle', 'what', 'which'},
+    'describe': {'decris', 'decrire', 'describe', 'detail', 'details', 'detaille'},
+    'history': {'historique', 'history', 'revisions', 'rollouts'},
+    'logs': {'logs', 'log', 'journaux', 'journal'},
+    'check': {'verifie', 'verifier', 'check', 'bilan'},
+}
+# Generic verbs yield to a more specific one ("montre les logs du pod x" is a 'logs').
+GENERIC_VERBS = {'get'}
+
+RESOURCE_WORDS = {
+    'pods': {'pod', 'pods'},
+    'nodes': {'noeud', 'noeuds', 'node', 'nodes'},
+    'namespaces': {'namespaces'},
+    'deployments': {'deploiement', 'deploiements', 'deployment', 'deployments'},
+    'health': {'sante', 'health'},
+}
+# Counted only when no other resource is named ("etat du cluster", but "pods du cluster").
+WEAK_RESOURCE_WORDS = {'cluster': 'health'}
+
+FILLER_WORDS = {
+    'le', 'la', 'les', 'l', 'du', 'de', 'des', 'd', 'un', 'une', 'sur', 'dans', 'en', 'et', 'est', 'sont',
+    'me', 'moi', 'mes', 'mon', 'ma', 'nos', 'tous', 'toutes', 'tout', 'il', 'y', 'a', 's', 'stp', 'svp',
+    'etat', 'statut', 'status', 'actuels', 'actuelles', 'the', 'an', 'of', 'all', 'are', 'is', 'my', 'our',
+    'me', 'please', 'in', 'on', 'for', 'current',
+}
+
+VOCABULARY = FILLER_WORDS | set(WEAK_RESOURCE_WORDS).union(
+    *VERB_WORDS.values(), *RESOURCE_WORDS.values())
+
+# Slots are matched on the normalized text and removed before the word check.
+# The values of CASED_SLOTS are taken from the text as typed (label values, context names).
+SLOT_PATTERNS = [
+    ('all_namespaces', re.compile(r"\b(?:dans|in|de|sur|across)\s+(?:tous\s+les|all)\s+(?:les\s+)?namespaces\b")),
+    ('cluster', re.compile(r"\b(?:sur|on|du|de|for)?\s*(?:le\s+|the\s+)?cluster\s+([a-z0-9][a-z0-9._@:/-]*)")),
+    ('namespace', re.compile(r"(?:\b(?:dans|in|du|de|from|of)\s+(?:le\s+|the\s+)?)?\b(?:namespace|ns)\s+([a-z0-9][a-z0-9-]*)")),
+    ('namespace', re.compile(r"(?<!\S)-n\s+([a-z0-9][a-z0-9-]*)")),
+    ('label_selector', re.compile(r"(?<!\S)(?:avec\s+(?:le\s+)?label|with\s+(?:the\s+)?label|label|-l)\s+([a-z0-9./_-]+(?:!=|==|=)[a-z0-9._-]*(?:,[a-z0-9./_-]+(?:!=|==|=)[a-z0-9._-]*)*)")),
+    ('tail_lines', re.compile(r"\b(?:les\s+)?(\d{1,5})\s+(?:dernieres\s+lignes|last\s+lines|lignes|lines)\b")),
+    ('tail_lines', re.compile(r"\b(?:last|les)\s+(\d{1,5})\s+(?:dernieres\s+)?(?:lines|lignes)\b")),
+]
+CASED_SLOTS = {'label_selector', 'cluster'}
+# "dans kube-system" / "in kube-system": a namespace given without the keyword.
+BARE_NAMESPACE = re.compile(r"\b(?:dans|in)\s+(?:le\s+|the\s+)?([a-z0-9][a-z0-9-]*)\s*$")
+
+# Verbs that act on one object (or a label selection), never on a whole collection.
+TARGETED_VERBS = {'describe', 'history', 'logs'}
+CONTEXT_PARAMS = {'v1', 'apps_v1'}
+# Cross-namespace lookups used to find the namespace of a named object.
+NAME_LOOKUPS = {'pods': ('v1', 'list_pod_for_all_namespaces'),
+                'deployments': ('apps_v1', 'list_deployment_for_all_namespaces')}
+
+
+class Intent(NamedTuple):
+    verb: str
+    resource: str
+    args: dict
+
+    def __str__(self):
+        target = self.args.get('name') or self.args.get('label_selector') or ''
+        where = f" (NS: {self.args['namespace']})" if self.args.get('namespace') else ""
+        cluster = f" [cluster {self.args['cluster']}]" if self.args.get('cluster') else ""
+        return f"{self.verb} {self.resource} {target}".rstrip() + where + cluster
+
+
+def normalize(text: str, lower: bool = True) -> str:
+    """Strips accents and trailing punctuation; with `lower`, also the case."""
+    text = text.replace('œ', 'oe').replace('Œ', 'OE').replace('’', ' ').replace("'", ' ')
+    text = unicodedata.normalize('NFKD', text)
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    text = re.sub(r"[?!,;:]+(?=\s|$)|\s+\.(?=\s|$)|\.$", ' ', text).strip()
+    return _lower(text) if lower else text
+
+
+def _lower(text: str) -> str:
+    # Character by character, so offsets in the result are valid in the original.
+    return ''.join(c.lower() if len(c.lower()) == 1 else c for c in text)
+
+
+def _signature(handler):
+    params = inspect.signature(handler).parameters.values()
+    accepted = {p.name for p in params if p.kind is not p.VAR_KEYWORD} - CONTEXT_PARAMS
+    required = {p.name for p in params if p.default is p.empty and p.kind is not p.VAR_KEYWORD} - CONTEXT_PARAMS
+    return accepted, required
+
+
+def parse(text: str) -> Optional[Intent]:
+    """Maps `text` to a read Intent, or None if it is not fully understood."""
+    cased = normalize(text, lower=False)
+    text = _lower(cased)
+    args = {}
+    for slot, pattern in SLOT_PATTERNS:
+        for match in pattern.finditer(text):
+            if slot == 'all_namespaces' or match.group(1) not in VOCABULARY:
+                if slot != 'all_namespaces':
+                    value = cased[match.start(1):match.end(1)] if slot in CASED_SLOTS else match.group(1)
+                    args.setdefault(slot, value)
+                text = (text[:match.start()] + ' ' + text[match.end():]).strip()
+                cased = (cased[:match.start()] + ' ' + cased[match.end():]).strip()
+                break
+    if 'namespace' not in args:
+        match = BARE_NAMESPACE.search(text)
+        if match and match.group(1) not in VOCABULARY:
+            args['namespace'] = match.group(1)
+            text = text[:match.start()].strip()
+
+    verbs, resources, weak, leftovers = set(), set(), set(), []
+    for word in text.split():
+        matched = False
+        for verb, words in VERB_WORDS.items():
+            if word in words:
+                verbs.add(verb)
+                matched = True
+        for resource, words in RESOURCE_WORDS.items():
+            if word in words:
+                resources.add(resource)
+                matched = True
+        if word in WEAK_RESOURCE_WORDS:
+            weak.add(WEAK_RESOURCE_WORDS[word])
+        elif not matched and word not in FILLER_WORDS:
+            leftovers.append(word)
+
+    resources = resources or weak
+    if len(verbs) > 1:
+        verbs -= GENERIC_VERBS
+    if len(resources) != 1 or len(verbs) > 1:
+        return None
+    resource = resources.pop()
+    candidates = [verb for verb in READ_VERBS if (verb, resource) in HANDLER_REGISTRY]
+    verb = verbs.pop() if verbs else 'get'
+    if (verb, resource) not in HANDLER_REGISTRY and verb in GENERIC_VERBS and len(candidates) == 1:
+        verb = candidates[0]
+    if verb not in READ_VERBS or (verb, resource) not in HANDLER_REGISTRY:
+        return None
+
+    accepted, required = _signature(HANDLER_REGISTRY[(verb, resource)])
+    if leftovers:
+        if len(leftovers) > 1 or 'name' not in accepted:
+            return None
+        args['name'] = leftovers[0]
+    if verb in TARGETED_VERBS and not (args.get('name') or args.get('label_selector')):
+        return None
+    if 'tail_lines' in args:
+        args['tail_lines'] = int(args['tail_lines'])
+    if set(args) - accepted - {'cluster'}:
+        return None
+    if required - set(args) - {'namespace'}:
+        return None
+    return Intent(verb, resource, args)
+
+
+def resolve_namespace(intent: Intent) -> Optional[Intent]:
+    """Fills in the namespace of a named object when exactly one object has that name."""
+    if intent.args.get('namespace') or not intent.args.get('name'):
+        return intent
+    lookup = NAME_LOOKUPS.get(intent.resource)
+    if lookup is None:
+        return None
+    try:
+        clusters = k8s_clients.get(intent.args.get('cluster'))
+        api = getattr(clusters, lookup[0])
+        items = getattr(api, lookup[1])(field_selector=f"metadata.name={intent.args['name']}", limit=2).items
+    except Exception:
+        return None
+    if len(items) != 1:
+        return None
+    return Intent(intent.verb, intent.resource, dict(intent.args, namespace=items[0].metadata.namespace))
+
+
+class IntentRouter:
+    """Routes understood commands straight to kubernetes_tool and counts hits and misses."""
+
+    def __init__(self, recent_misses=20):
+        self.hits = Counter()
+        self.misses = 0
+        self.recent_misses = deque(maxlen=recent_misses)
+        self._lock = threading.Lock()
+
+    def match(self, text: str) -> Optional[Intent]:
+        intent = parse(text)
+        if intent is not None:
+            intent = resolve_namespace(intent)
+        with self._lock:
+            if intent is None:
+                self.misses += 1
+                self.recent_misses.append(text)
+            else:
+                self.hits[f"{intent.verb} {intent.resource}"] += 1
+        return intent
+
+    def route(self, text: str) -> Optional[str]:
+        """Handler output for `text` (prefixed with the intent), or None to defer to the agent."""
+        intent = self.match(text)
+        if intent is None:
+            return None
+        tracer.start_turn()
+        result = k8s_client.kubernetes_tool(intent.verb, intent.resource, **intent.args)
+        return f"[direct] {intent}\n{result}"
+
+    def stats(self) -> dict:
+        with self._lock:
+            hits = sum(self.hits.values())
+            total = hits + self.misses
+            return {
+                'hits': hits, 'misses': self.misses, 'hit_rate': hits / total if total else 0.0,
+                'by_intent': dict(self.hits.most_common()), 'recent_misses': list(self.recent_misses),
+            }
+
+
+intent_router = IntentRouter()
@@ -0,0 +1,98 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from kubernetes import dynamic
+from kubernetes.dynamic.exceptions import ConflictError
+from .resilience import with_current_deadline
+from .tracing import tracer
+
+FIELD_MANAGER = 'mcp-server'
+MAX_WORKERS = 8
+
+# Apply order: a kind is only applied once every lower tier is done.
+# Unknown kinds (custom resources, ...) go last, after their CRDs exist.
+KIND_TIERS = {
+    'Namespace': 0, 'CustomResourceDefinition': 0, 'PriorityClass': 0, 'StorageClass': 0,
+    'ServiceAccount': 1, 'ClusterRole': 1, 'Role': 1, 'ClusterRoleBinding': 1, 'RoleBinding': 1,
+    'ConfigMap': 1, 'Secret': 1, 'PersistentVolume': 1, 'PersistentVolumeClaim': 1,
+    'LimitRange': 1, 'ResourceQuota': 1,
+    'Service': 2,
+    'Deployment': 3, 'StatefulSet': 3, 'DaemonSet': 3, 'ReplicaSet': 3, 'Job': 3, 'CronJob': 3, 'Pod': 3,
+    'Ingress': 4, 'HorizontalPodAutoscaler': 4, 'PodDisruptionBudget': 4, 'NetworkPolicy': 4,
+}
+UNKNOWN_TIER = 5
+
+
+class ApplyResult:
+    def __init__(self, doc):
+        metadata = doc.get('metadata') or {}
+        self.doc = doc
+        self.kind = doc.get('kind', 'Resource')
+        self.name = metadata.get('name', 'unnamed')
+        self.namespace = metadata.get('namespace')
+        self.elapsed = 0.0
+        self.error = None
+
+    def __str__(self):
+        target = f"{self.kind}/{self.name}" + (f" (NS: {self.namespace})" if self.namespace else "")
+        if self.error:
+            return f"- {target}: échec après {self.elapsed * 1000:.0f} ms: {self.error}"
+        return f"- {target}: appliqué en {self.elapsed * 1000:.0f} ms"
+
+
+def tiers(docs):
+    """Groups manifest documents by dependency tier, in apply order."""
+    grouped = {}
+    for doc in docs:
+        grouped.setdefault(KIND_TIERS.get(doc.get('kind'), UNKNOWN_TIER), []).append(doc)
+    return [grouped[tier] for tier in sorted(grouped)]
+
+
+def _apply_one(dyn, resource, result, force):
+    start = time.perf_counter()
+    try:
+        if resource.namespaced and not result.namespace:
+            result.namespace = 'default'
+        dyn.server_side_apply(
+            resource, body=result.doc, name=result.name,
+            namespace=result.namespace if resource.namespaced else None,
+            field_manager=FIELD_MANAGER, force_conflicts=force,
+        )
+    except ConflictError as e:
+        result.error = (f"conflit de propriété de champs ({e.summary() or e.reason}). Ces champs appartiennent "
+                        f"à un autre gestionnaire (HPA, contrôleur, kubectl...) ; relancez avec force=True "
+                        f"pour en prendre la propriété.")
+    except Exception as e:
+        result.error = e.summary() if hasattr(e, 'summary') else e
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def apply_objects(api_client, docs, force=False, max_workers=MAX_WORKERS):
+    """Server-side applies `docs` tier by tier, with the objects of a tier applied concurrently.
+
+    Server-side apply makes re-runs idempotent: existing objects are patched,
+    missing ones created. Like kubectl, fields owned by another manager are a
+    conflict unless `force` takes them over. Returns one ApplyResult per
+    document, in apply order.
+    """
+    dyn = dynamic.DynamicClient(api_client)
+    apply_one = with_current_deadline(tracer.bind(_apply_one))
+    results = []
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for tier_docs in tiers(docs):
+            # Discovery is not thread-safe, so kinds are resolved before fanning out.
+            jobs = []
+            for doc in tier_docs:
+                result = ApplyResult(doc)
+                results.append(result)
+                try:
+                    resource = dyn.resources.get(api_version=doc.get('apiVersion'), kind=result.kind)
+                except Exception as e:
+                    result.error = e
+                    continue
+                jobs.append(pool.submit(apply_one, dyn, resource, result, force))
+            for job in jobs:
+                job.result()
+            if any(doc.get('kind') == 'CustomResourceDefinition' for doc in tier_docs):
+                dyn.resources.invalidate_cache()
+    return results
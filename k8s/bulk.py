@@ -0,0 +1,74 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from .pagination import iter_items
+from .resilience import with_current_deadline
+from .tracing import tracer
+
+# Objects patched concurrently by one bulk action.
+MAX_WORKERS = int(os.getenv('MCP_BULK_WORKERS', '8'))
+
+
+def namespaces_of(namespace):
+    """Splits a comma-separated namespace set; None means all namespaces."""
+    if not namespace:
+        return None
+    return [ns.strip() for ns in namespace.split(',') if ns.strip()]
+
+
+def resolve_deployments(apps_v1, label_selector, namespace=None):
+    """Returns the sorted (namespace, name) pairs of the deployments matching `label_selector`."""
+    if not label_selector:
+        raise ValueError("Une action groupée nécessite un label_selector.")
+    namespaces = namespaces_of(namespace)
+    if namespaces is None:
+        items = iter_items(apps_v1.list_deployment_for_all_namespaces, label_selector=label_selector)
+    else:
+        items = (item for ns in namespaces
+                 for item in iter_items(apps_v1.list_namespaced_deployment, ns, label_selector=label_selector))
+    return sorted((item.metadata.namespace, item.metadata.name) for item in items)
+
+
+class BulkResult:
+    def __init__(self, namespace, name):
+        self.namespace = namespace
+        self.name = name
+        self.elapsed = 0.0
+        self.message = None
+        self.error = None
+
+    def __str__(self):
+        target = f"{self.namespace}/{self.name}"
+        if self.error:
+            return f"- {target}: échec après {self.elapsed * 1000:.0f} ms: {self.error}"
+        return f"- {target}: {self.message} ({self.elapsed * 1000:.0f} ms)"
+
+
+def _run_one(action, result):
+    start = time.perf_counter()
+    try:
+        result.message = action(result.namespace, result.name)
+    except Exception as e:
+        result.error = f"{e.status} {e.reason}" if hasattr(e, 'status') and hasattr(e, 'reason') else e
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def run_bulk(action, targets, max_workers=MAX_WORKERS):
+    """Calls `action(namespace, name)` for every target, at most `max_workers` at a time.
+
+    Failures are recorded per object and never stop the others. Returns one
+    BulkResult per target, in target order.
+    """
+    results = [BulkResult(namespace, name) for namespace, name in targets]
+    if not results:
+        return results
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(results))) as pool:
+        list(pool.map(with_current_deadline(tracer.bind(lambda result: _run_one(action, result))), results))
+    return results
+
+
+def format_bulk(title, results):
+    failures = sum(1 for result in results if result.error)
+    header = f"{title}: {len(results) - failures} réussi(s), {failures} échec(s) sur {len(results)} déploiement(s)."
+    return "\n".join([header, *(str(result) for result in results)])
@@ -0,0 +1,88 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# Seconds a read result stays valid, per verb. Verbs not listed are never cached.
+DEFAULT_TTLS = {
+    'get': 5,
+    'describe': 5,
+    'history': 30,
+    'check': 10,
+    'logs': 2,
+}
+
+
+class ResultCache:
+    """Size-bounded LRU of tool results with a per-verb TTL.
+
+    Keys are (verb, resource, namespace, name, cluster, other arguments). A
+    mutating call invalidates every entry of its cluster for its namespace plus
+    the cluster-wide entries (namespace None), which may include objects from it.
+    """
+
+    def __init__(self, max_entries=256, ttls=None):
+        self.max_entries = max_entries
+        self.ttls = ttls if ttls is not None else DEFAULT_TTLS
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def key(verb, resource, namespace=None, name=None, cluster=None, **kwargs):
+        extra = tuple(sorted((k, v) for k, v in kwargs.items() if v is not None))
+        return (verb, resource, namespace, name, cluster, extra)
+
+    def get(self, key):
+        """Returns the cached result, or None on a miss or expired entry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, result):
+        ttl = self.ttls.get(key[0])
+        if not ttl:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, namespace=None, cluster=None):
+        """Drops entries a mutation in `namespace` of `cluster` may have made stale (None means all)."""
+        with self._lock:
+            stale = [
+                key for key in self._entries
+                if (cluster is None or key[4] == cluster) and (namespace is None or key[2] in (namespace, None))
+            ]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'invalidations': self.invalidations,
+            }
+
+
+result_cache = ResultCache(max_entries=int(os.getenv('MCP_RESULT_CACHE_SIZE', '256')))
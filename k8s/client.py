@@ -1,9 +1,23 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 from kubernetes.client.rest import ApiException
+from urllib3.exceptions import HTTPError
 
 
 from .config import k8s_clients
 from . import router
+from . import handlers  # noqa: F401  (registers the handlers)
+from .cache import result_cache
+from .bulk import resolve_deployments
+from .resilience import CircuitOpenError, DeadlineExceeded, deadline, verb_deadline, with_current_deadline
+from .tracing import tracer
+
+RESULT_CACHE_ENABLED = os.getenv('MCP_RESULT_CACHE', '1') != '0'
+ALL_CLUSTERS = 'all'
+FANOUT_WORKERS = 16
+# Mutations that act on every deployment matching a label selector when no name is given.
+BULK_VERBS = {'restart', 'scale'}
 
 def kubernetes_tool(
     verb: str,
@@ -12,7 +26,20 @@ def kubernetes_tool(
     namespace: Optional[str] = None,
     replicas: Optional[int] = None,
     application_name: Optional[str] = None,
-    image: Optional[str] = None
+    image: Optional[str] = None,
+    label_selector: Optional[str] = None,
+    field_selector: Optional[str] = None,
+    container: Optional[str] = None,
+    since_seconds: Optional[int] = None,
+    tail_lines: Optional[int] = None,
+    pattern: Optional[str] = None,
+    follow_seconds: Optional[int] = None,
+    manifest: Optional[str] = None,
+    force: Optional[bool] = None,
+    wait_seconds: Optional[int] = None,
+    output: Optional[str] = None,
+    since_revision: Optional[str] = None,
+    cluster: Optional[str] = None
 ) -> str:
     """
     Tool to interact with the Kubernetes API.
@@ -21,34 +48,135 @@ def kubernetes_tool(
         verb (str): The action to perform.
         resource (str): The type of resource to act upon.
         name (Optional[str]): The name of the specific resource.
-        namespace (Optional[str]): The namespace of the resource.
+        namespace (Optional[str]): The namespace of the resource. For a label-selector 'restart'/'scale':
+            one namespace, a comma-separated set, or omitted for all namespaces.
         replicas (Optional[int]): The number of replicas for a 'scale' or 'deploy' operation.
         application_name (Optional[str]): The name for a new application to deploy.
         image (Optional[str]): The container image for a new application to deploy.
+        label_selector (Optional[str]): Label selector to filter 'get' results server-side (e.g. 'app=web,tier!=cache').
+            For 'restart' and 'scale' without a name, acts on every matching deployment at once (one confirmation).
+        field_selector (Optional[str]): Field selector to filter 'get' results server-side (e.g. 'status.phase!=Running').
+        container (Optional[str]): For 'logs', restrict to this container (default: all containers).
+        since_seconds (Optional[int]): For 'logs', only lines from the last N seconds.
+        tail_lines (Optional[int]): For 'logs', the last N lines of each stream (default 50).
+        pattern (Optional[str]): For 'logs', keep only lines matching this regular expression.
+        follow_seconds (Optional[int]): For 'logs', follow the streams for N seconds.
+        manifest (Optional[str]): For 'apply', a (multi-document) YAML manifest.
+        force (Optional[bool]): For 'apply', take over fields owned by another manager (e.g. spec.replicas
+            managed by an HPA). Only set it when the user explicitly asks after a reported conflict.
+        wait_seconds (Optional[int]): For 'restart', 'scale', 'undo' and 'deploy', how long to watch the
+            rollout before answering with its final status and timeline (default 120; 0 to return at once).
+            With a label_selector, every selected rollout is watched within this same window.
+            No need to poll with 'get' afterwards.
+        output (Optional[str]): For 'get pods', 'get deployments' and 'check health': 'summary' for counts by
+            namespace/phase/readiness/restarts plus the top offenders, 'full' for one line per object. By default
+            the summary is used automatically on large results.
+        since_revision (Optional[str]): For 'check health', only report the problems that appeared, changed or
+            were resolved since this revision, given exactly as a previous check stated it (e.g. '3f9c2a1b:241').
+            Use it for repeated checks.
+        cluster (Optional[str]): The kubeconfig context to target (default: current context).
+            'all' runs a read verb on every cluster in parallel.
 
     Verb-Resource Mapping:
     - 'get': ['nodes', 'namespaces', 'pods', 'deployments']
     - 'describe': ['pods', 'deployments']
     - 'history': ['deployments']
     - 'undo': ['deployments']
-    - 'restart': ['deployments']
-    - 'scale': ['deployments']
-    - 'logs': ['pods']
+    - 'restart': ['deployments'] (a name, or a label_selector for many)
+    - 'scale': ['deployments'] (a name, or a label_selector for many)
+    - 'logs': ['pods', 'deployments'] ('pods' takes a name or a label_selector)
     - 'check': ['health']
     - 'deploy': ['application']
+    - 'apply': ['manifest']
     """
-    if k8s_clients.error:
-        return f"Erreur de configuration Kubernetes: {k8s_clients.error}"
+    tool_args = dict(
+        name=name, namespace=namespace, replicas=replicas,
+        application_name=application_name, image=image,
+        label_selector=label_selector, field_selector=field_selector,
+        container=container, since_seconds=since_seconds, tail_lines=tail_lines,
+        pattern=pattern, follow_seconds=follow_seconds, manifest=manifest, force=force,
+        wait_seconds=wait_seconds, output=output, since_revision=since_revision
+    )
+    return run_tool(verb, resource, cluster, tool_args)
+
+def is_bulk(action) -> bool:
+    """Whether a kubernetes_tool call (as a dict) targets deployments by label selector."""
+    return (action.get('verb') in BULK_VERBS and action.get('resource') == 'deployments'
+            and not action.get('name') and bool(action.get('label_selector')))
+
+def bulk_targets(action):
+    """Resolves the (namespace, name) deployments a bulk action would touch, for confirmation."""
+    clusters = k8s_clients.get(action.get('cluster'))
+    if clusters.error:
+        raise clusters.error
+    return resolve_deployments(clusters.apps_v1, action['label_selector'], action.get('namespace'))
+
+def run_action(action, targets=None):
+    """Runs a kubernetes_tool call given as a dict; `targets` pins the objects of a confirmed bulk action."""
+    if targets is None:
+        return kubernetes_tool(**action)
+    tool_args = dict(action)
+    verb, resource, cluster = tool_args.pop('verb'), tool_args.pop('resource'), tool_args.pop('cluster', None)
+    return _run(verb, resource, cluster, dict(tool_args, targets=targets))
+
+def run_tool(verb, resource, cluster, tool_args):
+    if cluster != ALL_CLUSTERS:
+        return _run(verb, resource, cluster, tool_args)
+
+    if verb not in router.READ_VERBS:
+        return f"Erreur: L'action '{verb}' ne peut pas être exécutée sur tous les clusters à la fois."
+    try:
+        contexts = k8s_clients.contexts()
+    except Exception as e:
+        return f"Erreur de configuration Kubernetes: {e}"
+    # One budget for the whole fan-out, shared by every cluster's call.
+    budget = verb_deadline(verb, tool_args.get('follow_seconds'))
+    with deadline(budget), ThreadPoolExecutor(max_workers=min(len(contexts), FANOUT_WORKERS) or 1) as pool:
+        run = with_current_deadline(tracer.bind(lambda context: _run(verb, resource, context, tool_args)))
+        results = list(pool.map(run, contexts))
+    return "\n\n".join(f"=== Cluster: {context} ===\n{result}" for context, result in zip(contexts, results))
+
+def _run(verb, resource, cluster, tool_args):
+    with k8s_clients.use(cluster) as clusters:
+        return _run_on(clusters, verb, resource, tool_args)
+
+def _run_on(clusters, verb, resource, tool_args):
+    if clusters.error:
+        return f"Erreur de configuration Kubernetes: {clusters.error}"
+
+    namespace = tool_args.get('namespace')
+    if namespace and ',' in namespace:
+        namespace = None  # A namespace set: invalidate the whole cluster.
+    cacheable = RESULT_CACHE_ENABLED and verb in router.READ_VERBS and not tool_args.get('follow_seconds')
+    if cacheable:
+        cache_key = result_cache.key(verb, resource, cluster=clusters.context, **tool_args)
+        cached = result_cache.get(cache_key)
+        if cached is not None:
+            return cached
+    elif verb not in router.READ_VERBS:
+        result_cache.invalidate(namespace, cluster=clusters.context)
 
     try:
         # We need to pass all potential arguments to dispatch
-        return router.dispatch(
+        result = router.dispatch(
             verb, resource,
-            v1=k8s_clients.v1, apps_v1=k8s_clients.apps_v1,
-            name=name, namespace=namespace, replicas=replicas,
-            application_name=application_name, image=image
+            v1=clusters.v1, apps_v1=clusters.apps_v1, informers=clusters.informers,
+            fast_read=clusters.fast_read,
+            **tool_args
         )
     except ApiException as e:
         return f"Erreur API Kubernetes ({e.status}): {e.reason}"
+    except CircuitOpenError as e:
+        return f"Erreur: {e}"
+    except (DeadlineExceeded, HTTPError) as e:
+        return f"Erreur: L'API Kubernetes n'a pas répondu à temps ({e})."
     except Exception as e:
         return f"Une erreur inattendue est survenue dans l'outil Kubernetes: {e}"
+    finally:
+        if verb not in router.READ_VERBS:
+            # Again after the call, in case a read cached pre-mutation state meanwhile.
+            result_cache.invalidate(namespace, cluster=clusters.context)
+
+    if cacheable:
+        result_cache.put(cache_key, result)
+    return result
@@ -1,14 +1,84 @@
 import os
+import socket
+import threading
+import time
+from contextlib import contextmanager
 from typing import Optional
 from kubernetes import client, config
+from urllib3.connection import HTTPConnection
+from .informer import InformerCache
+from .tracing import instrument_api_client
+from .resilience import CircuitBreaker, install_policy
 
-class K8sClientManager:
-    _instance = None
+# Parallel requests allowed per apiserver (urllib3 defaults to 4, too few for fan-out).
+CONNECTION_POOL_SIZE = int(os.getenv('MCP_CONNECTION_POOL_SIZE', '32'))
+# Seconds without use after which a cluster's clients (and informers) are released.
+IDLE_TIMEOUT = float(os.getenv('MCP_CLUSTER_IDLE_TIMEOUT', '900'))
+
+KEEPALIVE_SOCKET_OPTIONS = HTTPConnection.default_socket_options + [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+
+
+def _check_kubeconfig(kubeconfig_file):
+    if not os.path.exists(kubeconfig_file):
+        raise FileNotFoundError(f"Fichier de configuration '{kubeconfig_file}' introuvable.")
+
+
+class ClusterClients:
+    """API clients for one kubeconfig context, with a tuned connection pool."""
 
     v1: Optional[client.CoreV1Api]
     apps_v1: Optional[client.AppsV1Api]
+    informers: Optional[InformerCache]
     error: Optional[Exception]
 
+    def __init__(self, kubeconfig_file, context, fast_read):
+        self.context = context
+        self.fast_read = fast_read
+        self.api_client = None
+        self.v1 = None
+        self.apps_v1 = None
+        self.informers = None
+        self.error = None
+        self.breaker = CircuitBreaker(f"cluster {context}" if context else "cluster")
+        self.last_used = time.monotonic()
+        # Calls in progress; a cluster in use is never evicted.
+        self.users = 0
+
+        try:
+            _check_kubeconfig(kubeconfig_file)
+            configuration = client.Configuration()
+            config.load_kube_config(config_file=kubeconfig_file, context=context, client_configuration=configuration)
+            configuration.connection_pool_maxsize = CONNECTION_POOL_SIZE
+            self.api_client = client.ApiClient(configuration)
+            self.api_client.rest_client.pool_manager.connection_pool_kw['socket_options'] = KEEPALIVE_SOCKET_OPTIONS
+            instrument_api_client(self.api_client)
+            install_policy(self.api_client, self.breaker)
+            self.v1 = client.CoreV1Api(self.api_client)
+            self.apps_v1 = client.AppsV1Api(self.api_client)
+            if os.getenv('MCP_INFORMERS', '1') != '0':
+                self.informers = InformerCache(self.v1, self.apps_v1, raw=fast_read)
+        except Exception as e:
+            self.error = e
+
+    def close(self):
+        if self.informers:
+            self.informers.stop()
+        if self.api_client:
+            self.api_client.close()
+
+
+class K8sClientManager:
+    """Process-wide pool of per-context cluster clients.
+
+    Entries are created on first use of a context and released once idle for
+    `IDLE_TIMEOUT` seconds. `v1`/`apps_v1`/`informers`/`error` refer to the
+    kubeconfig's current context.
+    """
+
+    _instance = None
+
+    fast_read: bool
+
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
@@ -20,20 +90,82 @@ class K8sClientManager:
             return
         self._initialized = True
 
-        self.v1 = None
-        self.apps_v1 = None
-        self.error = None
+        self.kubeconfig_file = os.getenv('KUBECONFIG', 'k3s.yaml')
+        self.fast_read = os.getenv('MCP_FAST_READ', '1') != '0'
+        self._current_context = None
+        self._clusters = {}
+        self._lock = threading.Lock()
+
+    def contexts(self):
+        """Names of all contexts in the kubeconfig."""
+        _check_kubeconfig(self.kubeconfig_file)
+        contexts, _ = config.list_kube_config_contexts(config_file=self.kubeconfig_file)
+        return [c['name'] for c in contexts]
+
+    def current_context(self):
+        if self._current_context is None:
+            _check_kubeconfig(self.kubeconfig_file)
+            _, active = config.list_kube_config_contexts(config_file=self.kubeconfig_file)
+            self._current_context = active['name']
+        return self._current_context
+
+    def get(self, context=None, acquire=False) -> ClusterClients:
+        """Returns the clients for `context` (default: current context), creating them on first use.
 
+        With `acquire`, the clients are also marked in use until `release()`.
+        """
         try:
-            kubeconfig_file = os.getenv('KUBECONFIG', 'k3s.yaml')
-            if not os.path.exists(kubeconfig_file):
-                raise FileNotFoundError(f"Fichier de configuration '{kubeconfig_file}' introuvable.")
+            context = context or self.current_context()
+        except Exception:
+            # Unreadable kubeconfig: building the clients records the error.
+            return ClusterClients(self.kubeconfig_file, context, self.fast_read)
 
-            config.load_kube_config(config_file=kubeconfig_file)
-            self.v1 = client.CoreV1Api()
-            self.apps_v1 = client.AppsV1Api()
+        with self._lock:
+            self._evict_idle(keep=context)
+            clusters = self._clusters.get(context)
+            if clusters is None or clusters.error:
+                clusters = ClusterClients(self.kubeconfig_file, context, self.fast_read)
+                self._clusters[context] = clusters
+            clusters.last_used = time.monotonic()
+            if acquire:
+                clusters.users += 1
+            return clusters
 
-        except Exception as e:
-            self.error = e
+    def release(self, clusters):
+        with self._lock:
+            clusters.users -= 1
+            clusters.last_used = time.monotonic()
+
+    @contextmanager
+    def use(self, context=None):
+        """The clients for `context`, kept from idle eviction for the whole block (follows, rollout waits)."""
+        clusters = self.get(context, acquire=True)
+        try:
+            yield clusters
+        finally:
+            self.release(clusters)
+
+    def _evict_idle(self, keep):
+        now = time.monotonic()
+        for context, clusters in list(self._clusters.items()):
+            if context != keep and not clusters.users and now - clusters.last_used > IDLE_TIMEOUT:
+                del self._clusters[context]
+                clusters.close()
+
+    @property
+    def v1(self):
+        return self.get().v1
+
+    @property
+    def apps_v1(self):
+        return self.get().apps_v1
+
+    @property
+    def informers(self):
+        return self.get().informers
+
+    @property
+    def error(self):
+        return self.get().error
 
 k8s_clients = K8sClientManager()
@@ -0,0 +1,93 @@
+import json
+
+# Python attribute names whose JSON key is not the plain camelCase form.
+_SPECIAL_KEYS = {
+    '_continue': 'continue',
+    'pod_ip': 'podIP',
+    'pod_i_ps': 'podIPs',
+    'host_ip': 'hostIP',
+    'host_i_ps': 'hostIPs',
+    'cluster_ip': 'clusterIP',
+}
+
+# String-to-string maps that handlers use like dicts (`.get`, `or {}`).
+_MAP_FIELDS = {'labels', 'annotations', 'match_labels', 'node_selector', 'data', 'capacity', 'allocatable'}
+
+
+def _json_key(attr):
+    special = _SPECIAL_KEYS.get(attr)
+    if special:
+        return special
+    head, *rest = attr.split('_')
+    return head + ''.join(word.capitalize() for word in rest)
+
+
+def _wrap(value):
+    if isinstance(value, dict):
+        return RawObject(value)
+    if isinstance(value, list):
+        return [_wrap(v) for v in value]
+    return value
+
+
+class RawObject:
+    """Read-only attribute view over a decoded JSON object.
+
+    Mirrors the typed models' snake_case attributes (`item.status.container_statuses`)
+    so handlers work unchanged, but only the fields actually read are touched.
+    Missing fields read as None, like unset model attributes.
+    """
+
+    __slots__ = ('_data',)
+
+    def __init__(self, data):
+        self._data = data
+
+    def __getattr__(self, attr):
+        if attr.startswith('__'):
+            raise AttributeError(attr)
+        value = self._data.get(_json_key(attr))
+        if attr in _MAP_FIELDS:
+            return value
+        return _wrap(value)
+
+    def to_dict(self):
+        return self._data
+
+    def __repr__(self):
+        return f"RawObject({self._data!r})"
+
+
+def _decode(response):
+    try:
+        return json.loads(response.data)
+    finally:
+        response.release_conn()
+
+
+class RawReadApi:
+    """Wraps a typed API object so its list_*/read_* calls skip model deserialization.
+
+    Responses are fetched with `_preload_content=False`, decoded once with
+    `json.loads` and returned as `RawObject` views. Log reads, watches and
+    every other method go to the wrapped API unchanged.
+    """
+
+    def __init__(self, api):
+        self._api = api
+
+    @staticmethod
+    def call(method, *args, **kwargs):
+        """Calls a generated list/read method and returns the decoded body as a RawObject."""
+        return RawObject(_decode(method(*args, _preload_content=False, **kwargs)))
+
+    def __getattr__(self, attr):
+        real = getattr(self._api, attr)
+        if not attr.startswith(('list_', 'read_')) or attr.endswith('_log'):
+            return real
+
+        def read(*args, **kwargs):
+            if kwargs.get('watch') or '_preload_content' in kwargs:
+                return real(*args, **kwargs)
+            return self.call(real, *args, **kwargs)
+        return read
@@ -0,0 +1 @@
+from . import app_handler, cluster_handler, deployment_handler, manifest_handler, pod_handler
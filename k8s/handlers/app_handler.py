@@ -1,7 +1,7 @@
 import yaml
-from kubernetes import utils
+from kubernetes import client, utils
 from ..router import register_handler
-from ..config import k8s_clients
+from .deployment_handler import with_rollout_status
 
 def _generate_manifest(application_name: str, image: str, replicas: int, port: int) -> str:
     """Internal function to generate a deployment manifest."""
@@ -35,6 +35,8 @@ def deploy_application(
     image: str,
     replicas: int = 1,
     port: int = 80,
+    wait_seconds=None,
+    v1=None,
     **kwargs
 ):
     """
@@ -43,14 +45,15 @@ def deploy_application(
     """
     manifest = _generate_manifest(application_name, image, replicas, port)
 
-    if not k8s_clients.v1:
-        return f"Erreur: Le client Kubernetes n'est pas initialisé. {k8s_clients.error}"
+    if not v1:
+        return "Erreur: Le client Kubernetes n'est pas initialisé."
 
-    api_client = k8s_clients.v1.api_client
+    api_client = v1.api_client
 
     try:
         utils.create_from_yaml(api_client, yaml_objects=yaml.safe_load_all(manifest))
-        return f"Application '{application_name}' déployée avec succès."
+        message = f"Application '{application_name}' déployée avec succès."
+        return with_rollout_status(client.AppsV1Api(api_client), message, application_name, 'default', wait_seconds)
     except utils.FailToCreateError as e:
         return f"Erreur lors du déploiement de '{application_name}': {e}"
     except Exception as e:
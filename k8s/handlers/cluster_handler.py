@@ -1,55 +1,94 @@
 from ..router import register_handler
+from ..pagination import iter_items
+from ..summary import MAX_OBJECTS, Collector, DeploymentSummary, PodSummary
+from ..health import DEPLOYMENT, NODE, POD, describe, find_problems, problem_line
 
 @register_handler('get', 'nodes')
-def get_nodes(v1, **kwargs):
-    items = v1.list_node().items
-    output = "Nœuds:\n"
-    for item in items:
-        status = next((c.status for c in item.status.conditions if c.type == 'Ready'), 'Inconnu')
-        output += f"- {item.metadata.name} (Statut: {'Prêt' if status == 'True' else 'Non Prêt'})\n"
-    return output
+def get_nodes(v1, label_selector=None, **kwargs):
+    lines = []
+    for item in iter_items(v1.list_node, label_selector=label_selector):
+        status = next((c.status for c in item.status.conditions or [] if c.type == 'Ready'), 'Inconnu')
+        lines.append(f"- {item.metadata.name} (Statut: {'Prêt' if status == 'True' else 'Non Prêt'})\n")
+    return "Nœuds:\n" + "".join(lines)
 
 @register_handler('get', 'namespaces')
 def get_namespaces(v1, **kwargs):
     """Liste tous les namespaces disponibles dans le cluster. Ne prend aucun argument."""
-    items = v1.list_namespace().items
-    output = "Namespaces:\n"
-    for item in items:
-        output += f"- {item.metadata.name} (Statut: {item.status.phase})\n"
-    return output
+    lines = [f"- {item.metadata.name} (Statut: {item.status.phase})\n" for item in iter_items(v1.list_namespace)]
+    return "Namespaces:\n" + "".join(lines)
 
 @register_handler('check', 'health')
-def check_cluster_health(v1, apps_v1, **kwargs):
-    """Effectue un bilan de santé du cluster en recherchant les problèmes courants."""
-    problems = []
-
-    try:
-        pods = v1.list_pod_for_all_namespaces().items
-        for pod in pods:
-            pod_status = getattr(pod, 'status', None)
-            pod_phase = getattr(pod_status, 'phase', 'Inconnu')
-
-            if pod_phase not in ['Running', 'Succeeded']:
-                problems.append(
-                    f"- Pod '{pod.metadata.name}' (NS: {pod.metadata.namespace}) est en état '{pod_phase}'."
-                )
-    except Exception as e:
-        problems.append(f"- Impossible de vérifier l'état des pods: {e}")
-
-    try:
-        deployments = apps_v1.list_deployment_for_all_namespaces().items
-        for dep in deployments:
-            desired = getattr(dep.spec, 'replicas', 0)
-            available = getattr(getattr(dep, 'status', None), 'available_replicas', 0)
-
-            if desired > available:
-                problems.append(
-                    f"- Déploiement '{dep.metadata.name}' (NS: {dep.metadata.namespace}) a seulement {available}/{desired} réplicas disponibles."
-                )
-    except Exception as e:
-        problems.append(f"- Impossible de vérifier l'état des déploiements: {e}")
-
-    if not problems:
-        return "Le bilan de santé du cluster n'a révélé aucune anomalie."
-
-    return "Bilan de santé du cluster:\n" + "\n".join(problems)
+def check_cluster_health(v1, apps_v1, output=None, since_revision=None, **kwargs):
+    """Effectue un bilan de santé du cluster: nœuds non prêts, pods en échec, en CrashLoopBackOff ou
+    redémarrant trop souvent, déploiements dégradés.
+
+    Avec les informers, la réponse vient de l'état qu'ils tiennent à jour, et
+    `since_revision` la limite aux changements postérieurs à cette révision.
+    """
+    health_monitor = getattr(v1, 'health_monitor', None)
+    monitor = health_monitor() if health_monitor else None
+    if monitor is None:
+        note = "Vue différentielle indisponible sans informers (MCP_INFORMERS=1) ; bilan complet.\n" if since_revision is not None else ""
+        return note + _scan(v1, apps_v1, output)
+
+    note = ""
+    if since_revision is not None:
+        revision, changes = monitor.changes_since(since_revision)
+        if changes is not None:
+            return _format_changes(since_revision, revision, changes, monitor.count())
+        note = (f"Révision {since_revision} inconnue, trop ancienne ou antérieure au redémarrage du suivi "
+                f"de santé ; bilan complet.\n")
+    revision, problems = monitor.snapshot()
+    return note + _format_problems(problems, output, revision=revision)
+
+def _scan(v1, apps_v1, output):
+    """Checks every node, pod and deployment through the API."""
+    problems, errors = [], []
+    sources = [(NODE, 'nœuds', v1.list_node), (POD, 'pods', v1.list_pod_for_all_namespaces),
+               (DEPLOYMENT, 'déploiements', apps_v1.list_deployment_for_all_namespaces)]
+    for kind, label, list_func in sources:
+        try:
+            problems += find_problems(kind, iter_items(list_func))
+        except Exception as e:
+            errors.append(f"- Impossible de vérifier l'état des {label}: {e}\n")
+    return _format_problems(problems, output, errors=errors)
+
+def _format_problems(problems, output, revision=None, errors=()):
+    sections = ["".join(problem_line(p) for p in problems if p.kind == NODE)]
+    pods = Collector(PodSummary("Pods en anomalie"), output)
+    deployments = Collector(DeploymentSummary("Déploiements dégradés"), output)
+    for problem in problems:
+        if problem.kind != NODE:
+            (pods if problem.kind == POD else deployments).add(problem.obj, lambda obj, p=problem: problem_line(p))
+    for collector in (pods, deployments):
+        if collector.summary.total:
+            sections.append(collector.summary.render() + "\n" if collector.summarized else "".join(collector.lines))
+    sections += errors
+
+    suffix = f" (révision {revision})" if revision is not None else ""
+    if not "".join(sections):
+        return f"Le bilan de santé du cluster n'a révélé aucune anomalie{suffix}."
+    return f"Bilan de santé du cluster{suffix}:\n" + "".join(sections).rstrip("\n")
+
+def _format_changes(since, revision, changes, total):
+    if not changes:
+        return f"Aucun changement depuis la révision {since} (révision {revision}, {total} problème(s) en cours)."
+    groups = {"Nouveaux problèmes": [], "Résolus ou supprimés": [], "Modifiés": []}
+    for (kind, namespace, name), (before, after) in changes.items():
+        target = describe(kind, namespace, name)
+        if before is None:
+            groups["Nouveaux problèmes"].append(f"- {target}: {after}.")
+        elif after is None:
+            groups["Résolus ou supprimés"].append(f"- {target} (était: {before}).")
+        else:
+            groups["Modifiés"].append(f"- {target}: {before} → {after}.")
+
+    lines = [f"Bilan de santé du cluster (révision {revision}), changements depuis la révision {since}:"]
+    for title, entries in groups.items():
+        if entries:
+            lines.append(f"{title} ({len(entries)}):")
+            lines += entries[:MAX_OBJECTS]
+            if len(entries) > MAX_OBJECTS:
+                lines.append(f"- ... et {len(entries) - MAX_OBJECTS} autre(s).")
+    lines.append(f"Problèmes en cours: {total}.")
+    return "\n".join(lines)
@@ -1,23 +1,73 @@
 import datetime
-import pytz
+import time
 from kubernetes import client
 from ..router import register_handler
+from ..pagination import iter_items
+from ..selectors import selector_string
+from ..logs import collect_logs, pod_targets, format_streams
+from ..summary import Collector, DeploymentSummary
+from ..bulk import format_bulk, resolve_deployments, run_bulk
+from ..rollout import DEFAULT_WAIT_SECONDS, wait_for_rollout
+
+REVISION_ANNOTATION = 'deployment.kubernetes.io/revision'
+
+def _revisions(apps_v1, deployment):
+    """Returns the (revision, ReplicaSet) pairs owned by `deployment`, oldest first.
+
+    Uses the informer's owner-UID index when available, otherwise lists only
+    the ReplicaSets matching the deployment's selector.
+    """
+    uid = deployment.metadata.uid
+    by_owner = getattr(apps_v1, 'replica_sets_by_owner', None)
+    owned = by_owner(uid) if by_owner else None
+    if owned is None:
+        candidates = apps_v1.list_namespaced_replica_set(
+            namespace=deployment.metadata.namespace,
+            label_selector=selector_string(deployment.spec.selector),
+        ).items
+        owned = [rs for rs in candidates if any(ref.uid == uid for ref in rs.metadata.owner_references or [])]
+
+    revisions = {}
+    for rs in owned:
+        revision = (rs.metadata.annotations or {}).get(REVISION_ANNOTATION)
+        if revision:
+            revisions[int(revision)] = rs
+    return sorted(revisions.items())
+
+def _unknown_rollout(e):
+    reason = f"{e.status} {e.reason}" if isinstance(e, client.ApiException) else e
+    return f"état du rollout inconnu: {reason}"
+
+def with_rollout_status(apps_v1, message, name, namespace, wait_seconds=None):
+    """Appends the outcome of the rollout started by a mutation, unless `wait_seconds` is 0.
+
+    The mutation already succeeded: a failure to watch the rollout is reported
+    as a warning, never as an error of the action itself.
+    """
+    wait = DEFAULT_WAIT_SECONDS if wait_seconds is None else int(wait_seconds)
+    if wait <= 0:
+        return message
+    try:
+        progress = wait_for_rollout(apps_v1, name, namespace, wait)
+    except Exception as e:
+        return f"{message}\nAvertissement: {_unknown_rollout(e)}."
+    return f"{message}\n{progress}"
+
+def _deployment_line(item):
+    return f"- NS: {item.metadata.namespace}, Nom: {item.metadata.name}, Prêts: {item.status.ready_replicas or 0}/{item.spec.replicas}\n"
 
 @register_handler('get', 'deployments')
-def get_deployments(apps_v1, namespace=None, **kwargs):
+def get_deployments(apps_v1, namespace=None, label_selector=None, field_selector=None, output=None, **kwargs):
     """List deployments in a specific namespace or in all namespaces."""
     if namespace:
-        items = apps_v1.list_namespaced_deployment(namespace).items
+        items = iter_items(apps_v1.list_namespaced_deployment, namespace, label_selector=label_selector, field_selector=field_selector)
     else:
-        items = apps_v1.list_deployment_for_all_namespaces().items
+        items = iter_items(apps_v1.list_deployment_for_all_namespaces, label_selector=label_selector, field_selector=field_selector)
 
-    output = "Déploiements:\n"
+    deployments = Collector(DeploymentSummary(), output)
     for item in items:
-        ready = item.status.ready_replicas or 0
-        total = item.spec.replicas
-        output += f"- NS: {item.metadata.namespace}, Nom: {item.metadata.name}, Prêts: {ready}/{total}\n"
-
-    return output if items else "Aucun déploiement trouvé."
+        deployments.add(item, _deployment_line)
+    return deployments.render("Déploiements:\n", "Aucun déploiement trouvé.")
 
 @register_handler('history', 'deployments')
 def get_deployment_history(apps_v1, name, namespace, **kwargs):
@@ -29,32 +79,15 @@ def get_deployment_history(apps_v1, name, namespace, **kwargs):
             return f"Error: Deployment '{name}' not found in namespace '{namespace}'."
         raise
 
-    all_replicasets = apps_v1.list_namespaced_replica_set(namespace=namespace).items
-    owned_replicasets = []
-    for rs in all_replicasets:
-        if rs.metadata.owner_references:
-            for owner in rs.metadata.owner_references:
-                if owner.uid == deployment.metadata.uid:
-                    owned_replicasets.append(rs)
-                    break
-
-    if not owned_replicasets:
-        return f"No rollout history found for deployment '{name}'."
-
-    revisions = {}
-    for rs in owned_replicasets:
-        revision = rs.metadata.annotations.get('deployment.kubernetes.io/revision')
-        if revision:
-            change_cause = rs.metadata.annotations.get('kubernetes.io/change-cause', '<none>')
-            revisions[int(revision)] = change_cause
-
+    revisions = _revisions(apps_v1, deployment)
     if not revisions:
         return f"No rollout history found for deployment '{name}'."
 
     output = f"Historique des déploiements pour '{name}':\n"
     output += "REVISION  CHANGE-CAUSE\n"
-    for rev in sorted(revisions.keys()):
-        output += f"{rev:<9} {revisions[rev]}\n"
+    for rev, rs in revisions:
+        change_cause = (rs.metadata.annotations or {}).get('kubernetes.io/change-cause', '<none>')
+        output += f"{rev:<9} {change_cause}\n"
 
     return output
 
@@ -68,53 +101,106 @@ def describe_deployment(apps_v1, name, namespace, **kwargs):
         output += f"  - Redémarré le: {restarted_at}\n"
     return output
 
-@register_handler('restart', 'deployments')
-def restart_deployment(apps_v1, name, namespace, **kwargs):
-    restarted_at = datetime.datetime.utcnow().replace(tzinfo=pytz.UTC).isoformat()
+@register_handler('logs', 'deployments')
+def get_deployment_logs(v1, apps_v1, name, namespace, container=None,
+                        since_seconds=None, tail_lines=None, pattern=None, follow_seconds=None, **kwargs):
+    """Logs of every pod behind a deployment, fetched concurrently."""
+    deployment = apps_v1.read_namespaced_deployment(name=name, namespace=namespace)
+    pods = iter_items(v1.list_namespaced_pod, namespace, label_selector=selector_string(deployment.spec.selector))
+    targets = pod_targets(pods, container)
+    if not targets:
+        return f"Aucun pod trouvé pour le déploiement '{name}'."
+    streams = collect_logs(v1, targets, since_seconds=since_seconds, tail_lines=tail_lines,
+                           pattern=pattern, follow_seconds=follow_seconds)
+    return format_streams(streams, skipped=len(targets) - len(streams))
+
+def _bulk(apps_v1, title, patch, label_selector, namespace, targets, wait_seconds):
+    """Applies `patch(namespace, name)` to every deployment selected by `label_selector`, concurrently.
+
+    `targets` pins the (namespace, name) list confirmed by the user. Every
+    object is patched first; the rollouts are then watched together within one
+    `wait_seconds` window (default as for a single deployment, 0 to skip),
+    with a one-line outcome each.
+    """
+    if targets is None:
+        targets = resolve_deployments(apps_v1, label_selector, namespace)
+    if not targets:
+        return f"Aucun déploiement ne correspond au label_selector '{label_selector}'."
+    wait = DEFAULT_WAIT_SECONDS if wait_seconds is None else int(wait_seconds)
+
+    results = run_bulk(lambda ns, name: patch(ns, name) or "initié", targets)
+    if wait > 0:
+        until = time.monotonic() + wait
+
+        def watch_rollout(ns, name):
+            try:
+                progress = wait_for_rollout(apps_v1, name, ns, max(until - time.monotonic(), 0))
+            except Exception as e:
+                return f"initié ({_unknown_rollout(e)})"
+            if progress.failed:
+                raise RuntimeError(progress.message)
+            return progress.message if progress.done else f"toujours en cours ({progress.message})"
+
+        started = [result for result in results if not result.error]
+        outcomes = run_bulk(watch_rollout, [(result.namespace, result.name) for result in started])
+        for result, outcome in zip(started, outcomes):
+            result.elapsed += outcome.elapsed
+            result.message, result.error = outcome.message, outcome.error
+
+    return format_bulk(f"{title} ({label_selector or 'cibles confirmées'})", results)
+
+def _restart(apps_v1, namespace, name):
+    restarted_at = datetime.datetime.now(datetime.timezone.utc).isoformat()
     body = {"spec": {"template": {"metadata": {"annotations": {"kubectl.kubernetes.io/restartedAt": restarted_at}}}}}
     apps_v1.patch_namespaced_deployment(name=name, namespace=namespace, body=body)
-    return f"Le redémarrage du déploiement '{name}' a été initié."
 
-@register_handler('scale', 'deployments')
-def scale_deployment(apps_v1, name, namespace, replicas, **kwargs):
-    replica_count = int(replicas)
+def _scale(apps_v1, namespace, name, replicas):
     scale_body = client.V1Scale(
         metadata=client.V1ObjectMeta(name=name, namespace=namespace),
-        spec=client.V1ScaleSpec(replicas=replica_count)
+        spec=client.V1ScaleSpec(replicas=replicas)
     )
     apps_v1.patch_namespaced_deployment_scale(name=name, namespace=namespace, body=scale_body)
-    return f"Le déploiement '{name}' a été mis à l'échelle à {replica_count} réplicas."
 
-@register_handler('undo', 'deployments')
-def undo_deployment_rollout(apps_v1, name, namespace, **kwargs):
-    """Annule le dernier déploiement (rollout) pour revenir à la version précédente."""
-    all_replicasets = apps_v1.list_namespaced_replica_set(namespace=namespace).items
+@register_handler('restart', 'deployments')
+def restart_deployment(apps_v1, name=None, namespace=None, label_selector=None, targets=None, wait_seconds=None, **kwargs):
+    """Restarts one deployment by name, or every deployment matching `label_selector` (namespace: one, a comma-separated set, or all)."""
+    if not name:
+        if not (label_selector or targets):
+            return "Erreur: Précisez un nom de déploiement ou un label_selector."
+        return _bulk(apps_v1, "Redémarrage groupé", lambda ns, n: _restart(apps_v1, ns, n),
+                     label_selector, namespace, targets, wait_seconds)
+    _restart(apps_v1, namespace, name)
+    message = f"Le redémarrage du déploiement '{name}' a été initié."
+    return with_rollout_status(apps_v1, message, name, namespace, wait_seconds)
 
-    owned_replicasets = []
-    deployment_uid = apps_v1.read_namespaced_deployment(name=name, namespace=namespace).metadata.uid
-    for rs in all_replicasets:
-        if rs.metadata.owner_references:
-            for owner in rs.metadata.owner_references:
-                if owner.uid == deployment_uid:
-                    owned_replicasets.append(rs)
-                    break
+@register_handler('scale', 'deployments')
+def scale_deployment(apps_v1, replicas, name=None, namespace=None, label_selector=None, targets=None, wait_seconds=None, **kwargs):
+    """Scales one deployment by name, or every deployment matching `label_selector`, to `replicas`."""
+    replica_count = int(replicas)
+    if not name:
+        if not (label_selector or targets):
+            return "Erreur: Précisez un nom de déploiement ou un label_selector."
+        return _bulk(apps_v1, f"Mise à l'échelle groupée à {replica_count} réplicas",
+                     lambda ns, n: _scale(apps_v1, ns, n, replica_count), label_selector, namespace, targets, wait_seconds)
+    _scale(apps_v1, namespace, name, replica_count)
+    message = f"Le déploiement '{name}' a été mis à l'échelle à {replica_count} réplicas."
+    return with_rollout_status(apps_v1, message, name, namespace, wait_seconds)
 
-    revisions = {}
-    for rs in owned_replicasets:
-        revision = rs.metadata.annotations.get('deployment.kubernetes.io/revision')
-        if revision:
-            revisions[int(revision)] = rs
+@register_handler('undo', 'deployments')
+def undo_deployment_rollout(apps_v1, name, namespace, wait_seconds=None, **kwargs):
+    """Annule le dernier déploiement (rollout) pour revenir à la version précédente."""
+    deployment = apps_v1.read_namespaced_deployment(name=name, namespace=namespace)
+    revisions = _revisions(apps_v1, deployment)
 
     if len(revisions) < 2:
         return f"Erreur: Pas d'historique de révision suffisant pour annuler le déploiement '{name}'. Une action 'undo' n'est possible qu'après un changement d'image, pas après un 'scale'."
 
-    sorted_revisions = sorted(revisions.keys(), reverse=True)
-    previous_revision_number = sorted_revisions[1]
-    previous_replicaset = revisions[previous_revision_number]
+    previous_revision_number, previous_replicaset = revisions[-2]
 
     api_client = client.ApiClient()
     template_dict = api_client.sanitize_for_serialization(previous_replicaset.spec.template)
     patch_body = {"spec": {"template": template_dict}}
 
     apps_v1.patch_namespaced_deployment(name=name, namespace=namespace, body=patch_body)
-    return f"Le rollback du déploiement '{name}' vers la révision {previous_revision_number} a été initié."
+    message = f"Le rollback du déploiement '{name}' vers la révision {previous_revision_number} a été initié."
+    return with_rollout_status(apps_v1, message, name, namespace, wait_seconds)
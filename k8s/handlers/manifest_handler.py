@@ -1,19 +1,22 @@
+import time
 import yaml
-from kubernetes import utils
 from ..router import register_handler
-from ..config import k8s_clients
+from ..apply import apply_objects
 
 @register_handler('apply', 'manifest')
-def apply_manifest(manifest: str, **kwargs):
+def apply_manifest(manifest: str, v1=None, force=None, **kwargs):
     """
-    Applies a Kubernetes manifest from a YAML string.
-    This function can handle multi-document YAML strings.
+    Applies a Kubernetes manifest from a YAML string with server-side apply.
+    This function can handle multi-document YAML strings; documents are applied
+    in dependency order (namespaces and CRDs first, workloads later) and
+    re-applying the same manifest is idempotent. Fields owned by another
+    manager are reported as conflicts unless `force` is set.
     """
     # Robustness check: Ensure the k8s client is available.
-    if not k8s_clients.v1:
-        return f"Erreur: Le client Kubernetes (CoreV1Api) n'est pas initialisé. {k8s_clients.error}"
+    if not v1:
+        return "Erreur: Le client Kubernetes (CoreV1Api) n'est pas initialisé."
 
-    api_client = k8s_clients.v1.api_client
+    api_client = v1.api_client
 
     try:
         yaml_objects = yaml.safe_load_all(manifest)
@@ -22,18 +25,18 @@ def apply_manifest(manifest: str, **kwargs):
         if not valid_objects:
             return "Erreur: Le manifeste YAML est vide ou invalide."
 
-        created_resources = []
-        for doc in valid_objects:
-            utils.create_from_dict(api_client, doc, verbose=False)
-            kind = doc.get('kind', 'Resource')
-            name = doc.get('metadata', {}).get('name', 'unnamed')
-            created_resources.append(f"{kind}/{name}")
+        start = time.perf_counter()
+        results = apply_objects(api_client, valid_objects, force=bool(force))
+        elapsed = time.perf_counter() - start
 
-        return f"Manifeste appliqué avec succès. Ressources créées/mises à jour : {', '.join(created_resources)}."
+        failures = sum(1 for result in results if result.error)
+        header = (
+            f"Manifeste appliqué: {len(results) - failures}/{len(results)} ressources créées/mises à jour "
+            f"en {elapsed:.1f} s."
+        )
+        return header + "\n" + "\n".join(str(result) for result in results)
 
     except yaml.YAMLError as e:
         return f"Erreur de parsing YAML: {e}"
-    except utils.FailToCreateError as e:
-        return f"Erreur lors de l'application du manifeste: {e}"
     except Exception as e:
         return f"Une erreur inattendue est survenue lors de l'application du manifeste: {e}"
@@ -1,15 +1,22 @@
 from ..router import register_handler
+from ..pagination import iter_items
+from ..logs import collect_logs, pod_targets, format_streams
+from ..summary import Collector, PodSummary, pod_counts
+
+def _pod_line(item):
+    ready, total, restarts = pod_counts(item)
+    return f"- NS: {item.metadata.namespace}, Nom: {item.metadata.name}, Prêts: {ready}/{total}, Statut: {item.status.phase}, Redémarrages: {restarts}\n"
 
 @register_handler('get', 'pods')
-def get_pods(v1, namespace=None, **kwargs):
-    items = v1.list_pod_for_all_namespaces().items if not namespace else v1.list_namespaced_pod(namespace).items
-    output = "Pods:\n"
+def get_pods(v1, namespace=None, label_selector=None, field_selector=None, output=None, **kwargs):
+    if namespace:
+        items = iter_items(v1.list_namespaced_pod, namespace, label_selector=label_selector, field_selector=field_selector)
+    else:
+        items = iter_items(v1.list_pod_for_all_namespaces, label_selector=label_selector, field_selector=field_selector)
+    pods = Collector(PodSummary(), output)
     for item in items:
-        ready = sum(1 for s in item.status.container_statuses if s.ready) if item.status.container_statuses else 0
-        total = len(item.spec.containers)
-        restarts = sum(s.restart_count for s in item.status.container_statuses) if item.status.container_statuses else 0
-        output += f"- NS: {item.metadata.namespace}, Nom: {item.metadata.name}, Prêts: {ready}/{total}, Statut: {item.status.phase}, Redémarrages: {restarts}\n"
-    return output if items else "Aucun pod trouvé."
+        pods.add(item, _pod_line)
+    return pods.render("Pods:\n", "Aucun pod trouvé.")
 
 @register_handler('describe', 'pods')
 def describe_pod(v1, name, namespace, **kwargs):
@@ -22,10 +29,22 @@ def describe_pod(v1, name, namespace, **kwargs):
     return output
 
 @register_handler('logs', 'pods')
-def get_pod_logs(v1, name, namespace, **kwargs):
-    container_name = v1.read_namespaced_pod(name=name, namespace=namespace).spec.containers[0].name
-    logs = v1.read_namespaced_pod_log(name=name, namespace=namespace, container=container_name, tail_lines=50)
-    output = f"Logs pour le pod '{name}' (conteneur: {container_name}):\n"
-    output += "--------------------------------------------------\n"
-    output += logs + "\n--------------------------------------------------"
-    return output
+def get_pod_logs(v1, namespace=None, name=None, label_selector=None, container=None,
+                 since_seconds=None, tail_lines=None, pattern=None, follow_seconds=None, **kwargs):
+    """Logs of one pod, or of every pod matching `label_selector`, across all their containers."""
+    if name:
+        pods = [v1.read_namespaced_pod(name=name, namespace=namespace)]
+    elif label_selector:
+        if namespace:
+            pods = list(iter_items(v1.list_namespaced_pod, namespace, label_selector=label_selector))
+        else:
+            pods = list(iter_items(v1.list_pod_for_all_namespaces, label_selector=label_selector))
+    else:
+        return "Erreur: Précisez un nom de pod ou un label_selector."
+
+    targets = pod_targets(pods, container)
+    if not targets:
+        return "Aucun pod ou conteneur correspondant trouvé."
+    streams = collect_logs(v1, targets, since_seconds=since_seconds, tail_lines=tail_lines,
+                           pattern=pattern, follow_seconds=follow_seconds)
+    return format_streams(streams, skipped=len(targets) - len(streams))
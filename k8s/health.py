@@ -0,0 +1,160 @@
+import os
+import threading
+import uuid
+from collections import deque
+from typing import Any, NamedTuple
+
+# A pod is flagged once its containers restarted this many times in total.
+RESTART_THRESHOLD = int(os.getenv('MCP_HEALTH_RESTART_THRESHOLD', '5'))
+# Problem changes kept for `since_revision` deltas; older revisions get the full view.
+HISTORY_SIZE = int(os.getenv('MCP_HEALTH_HISTORY', '10000'))
+
+HEALTHY_PHASES = {'Running', 'Succeeded'}
+WAITING_REASONS = {'CrashLoopBackOff', 'ImagePullBackOff', 'ErrImagePull'}
+
+NODE, POD, DEPLOYMENT = 'node', 'pod', 'deployment'
+KINDS = [NODE, POD, DEPLOYMENT]
+_ORDER = {kind: i for i, kind in enumerate(KINDS)}
+
+
+def node_problem(node):
+    ready = next((c for c in node.status.conditions or [] if c.type == 'Ready'), None)
+    if ready is None:
+        return "état Ready inconnu"
+    if ready.status != 'True':
+        return f"NotReady (Ready={ready.status}{', ' + ready.reason if ready.reason else ''})"
+    return None
+
+
+def pod_problem(pod):
+    reasons = []
+    phase = pod.status.phase or 'Inconnu'
+    if phase not in HEALTHY_PHASES:
+        reasons.append(f"en état '{phase}'")
+    statuses = pod.status.container_statuses or []
+    waiting = sorted({s.state.waiting.reason for s in statuses
+                      if s.state and s.state.waiting and s.state.waiting.reason in WAITING_REASONS})
+    reasons += waiting
+    restarts = sum(s.restart_count or 0 for s in statuses)
+    if restarts >= RESTART_THRESHOLD:
+        reasons.append(f"{restarts} redémarrages")
+    return ", ".join(reasons) or None
+
+
+def deployment_problem(deployment):
+    desired = deployment.spec.replicas or 0
+    available = deployment.status.available_replicas or 0
+    if desired > available:
+        return f"seulement {available}/{desired} réplicas disponibles"
+    return None
+
+
+PROBLEM_FUNCS = {NODE: node_problem, POD: pod_problem, DEPLOYMENT: deployment_problem}
+
+
+class Problem(NamedTuple):
+    kind: str
+    namespace: str
+    name: str
+    message: str
+    obj: Any
+
+
+def describe(kind, namespace, name):
+    if kind == NODE:
+        return f"Nœud '{name}'"
+    label = 'Pod' if kind == POD else 'Déploiement'
+    return f"{label} '{name}' (NS: {namespace})"
+
+
+def problem_line(problem):
+    return f"- {describe(problem.kind, problem.namespace, problem.name)}: {problem.message}.\n"
+
+
+def find_problems(kind, objects):
+    """Evaluates `objects` in one pass, for a check made without a monitor."""
+    problems = []
+    for obj in objects:
+        message = PROBLEM_FUNCS[kind](obj)
+        if message:
+            problems.append(Problem(kind, obj.metadata.namespace or '', obj.metadata.name, message, obj))
+    return problems
+
+
+class HealthMonitor:
+    """Problem state of one cluster, kept current by informer events.
+
+    Each object is re-evaluated when its informer reports a change, so a
+    check costs nothing beyond reading the state. Every change of a
+    problem bumps `revision` and is logged, which lets a check report only
+    what changed since an earlier revision. Revisions are reported as
+    `<id>:<revision>` tokens: a monitor recreated after an eviction has a new
+    id, so a token from its predecessor is not mistaken for one of its own.
+    """
+
+    SOURCES = {'nodes': NODE, 'pods': POD, 'deployments': DEPLOYMENT}
+
+    def __init__(self, history=HISTORY_SIZE):
+        self._problems = {}
+        self._changes = deque(maxlen=history)
+        self._lock = threading.Lock()
+        self.id = uuid.uuid4().hex[:8]
+        self.revision = 0
+
+    def handler(self, kind):
+        """The informer handler feeding objects of `kind`."""
+        return lambda key, obj: self.update(kind, key, obj)
+
+    def update(self, kind, key, obj):
+        message = PROBLEM_FUNCS[kind](obj) if obj is not None else None
+        key = (kind, *key)
+        with self._lock:
+            previous = self._problems.get(key)
+            if message:
+                self._problems[key] = Problem(kind, key[1], key[2], message, obj)
+            elif previous:
+                del self._problems[key]
+            before = previous.message if previous else None
+            if before != message:
+                self.revision += 1
+                self._changes.append((self.revision, key, before, message))
+
+    def token(self, revision):
+        return f"{self.id}:{revision}"
+
+    def _parse(self, token):
+        """The revision of one of this monitor's tokens, else None."""
+        monitor_id, _, revision = str(token).partition(':')
+        if monitor_id != self.id or not revision.isdigit():
+            return None
+        return int(revision)
+
+    def snapshot(self):
+        """Returns (token, problems sorted by kind, namespace and name)."""
+        with self._lock:
+            problems = list(self._problems.values())
+            revision = self.revision
+        return self.token(revision), sorted(problems, key=lambda p: (_ORDER[p.kind], p.namespace, p.name))
+
+    def changes_since(self, token):
+        """Returns (token, {key: (before, after)}) for the problems changed after `token`.
+
+        The changes are None when `token` comes from another monitor, or is
+        unknown or older than the kept history.
+        """
+        revision = self._parse(token)
+        with self._lock:
+            current = self.token(self.revision)
+            oldest = self._changes[0][0] if self._changes else self.revision + 1
+            if revision is None or revision > self.revision or revision < oldest - 1:
+                return current, None
+            changes = {}
+            for rev, key, before, after in self._changes:
+                if rev > revision:
+                    changes[key] = (changes[key][0] if key in changes else before, after)
+        ordered = sorted(changes.items(), key=lambda kv: (_ORDER[kv[0][0]], kv[0][1:]))
+        return current, {key: change for key, change in ordered if change[0] != change[1]}
+
+    def count(self):
+        with self._lock:
+            return len(self._problems)
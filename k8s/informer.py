@@ -0,0 +1,365 @@
+import os
+import threading
+import time
+from types import SimpleNamespace
+from kubernetes import watch
+from kubernetes.client.rest import ApiException
+from .selectors import label_matcher, field_matcher
+from .fastread import RawObject, RawReadApi
+from .health import HealthMonitor
+
+HTTP_GONE = 410
+# Seconds past the server-side watch timeout before a silent connection is given up (half-open socket).
+WATCH_READ_SLACK = 30
+
+# kwargs that a cached list can honour without asking the API server.
+_PASSTHROUGH_KWARGS = {'limit', '_continue', 'watch', 'resource_version'}
+
+
+def _key(obj):
+    return (obj.metadata.namespace or '', obj.metadata.name)
+
+
+def owner_uids(obj):
+    """Index function: the UIDs of an object's owners."""
+    return [ref.uid for ref in obj.metadata.owner_references or []]
+
+
+class _RawWatch(watch.Watch):
+    """Watch that leaves event objects as decoded JSON instead of building typed models."""
+
+    def get_return_type(self, func):
+        return None
+
+
+class Informer:
+    """Keeps a local copy of one resource collection, fed by list+watch.
+
+    The initial list gives a resourceVersion; the watch resumes from it and
+    a 410 Gone (expired resourceVersion) triggers a full relist. With `raw`,
+    the store holds `RawObject` views instead of typed models.
+    """
+
+    def __init__(self, list_func, watch_timeout=300, retry_delay=5, raw=False):
+        self._list_func = list_func
+        self._raw = raw
+        self._items = {}
+        self._indexers = {}
+        self._indices = {}
+        self._handlers = []
+        self._lock = threading.RLock()
+        self._synced = threading.Event()
+        self._settled = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._watch = None
+        self.watch_timeout = watch_timeout
+        self.retry_delay = retry_delay
+        self.resource_version = None
+        self.error = None
+        self.started_at = None
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self.started_at = time.monotonic()
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._watch:
+            self._watch.stop()
+
+    def wait_for_sync(self, timeout=None) -> bool:
+        return self._synced.wait(timeout)
+
+    def wait_for_first_list(self, timeout=None) -> bool:
+        """Waits until the first list succeeded or failed; returns whether the store is synced."""
+        self._settled.wait(timeout)
+        return self.has_synced
+
+    @property
+    def has_synced(self) -> bool:
+        return self._synced.is_set()
+
+    def list(self, namespace=None):
+        with self._lock:
+            items = sorted(self._items.items())
+        return [obj for (ns, _), obj in items if namespace is None or ns == namespace]
+
+    def get(self, name, namespace=None):
+        with self._lock:
+            return self._items.get((namespace or '', name))
+
+    def add_index(self, name, func):
+        """Maintains an index of the store under `name`; `func(obj)` returns the object's index values."""
+        with self._lock:
+            self._indexers[name] = func
+            self._indices[name] = {}
+            for key, obj in self._items.items():
+                self._index(name, key, obj)
+
+    def add_handler(self, func):
+        """Calls `func(key, obj)` for every object in the store, then on every change; `obj` is None on deletion.
+
+        Handlers run under the store lock, in event order, and must be quick.
+        """
+        with self._lock:
+            self._handlers.append(func)
+            for key, obj in self._items.items():
+                func(key, obj)
+
+    def by_index(self, name, value):
+        with self._lock:
+            keys = self._indices[name].get(value, ())
+            return [self._items[key] for key in sorted(keys)]
+
+    def _index(self, name, key, obj):
+        index = self._indices[name]
+        for value in self._indexers[name](obj):
+            index.setdefault(value, set()).add(key)
+
+    def _unindex(self, name, key, obj):
+        index = self._indices[name]
+        for value in self._indexers[name](obj):
+            keys = index.get(value)
+            if keys:
+                keys.discard(key)
+                if not keys:
+                    del index[value]
+
+    def _relist(self):
+        result = RawReadApi.call(self._list_func) if self._raw else self._list_func()
+        with self._lock:
+            previous, self._items = self._items, {_key(obj): obj for obj in result.items}
+            self.resource_version = result.metadata.resource_version
+            for name in self._indexers:
+                self._indices[name] = {}
+                for key, obj in self._items.items():
+                    self._index(name, key, obj)
+            for func in self._handlers:
+                for key in previous.keys() - self._items.keys():
+                    func(key, None)
+                for key, obj in self._items.items():
+                    func(key, obj)
+        self.error = None
+        self._synced.set()
+        self._settled.set()
+
+    def _apply(self, event_type, obj):
+        key = _key(obj)
+        with self._lock:
+            previous = self._items.pop(key, None)
+            if previous is not None:
+                for name in self._indexers:
+                    self._unindex(name, key, previous)
+            if event_type != 'DELETED':
+                self._items[key] = obj
+                for name in self._indexers:
+                    self._index(name, key, obj)
+            self.resource_version = obj.metadata.resource_version
+            for func in self._handlers:
+                func(key, None if event_type == 'DELETED' else obj)
+
+    def _watch_once(self):
+        self._watch = _RawWatch() if self._raw else watch.Watch()
+        stream = self._watch.stream(
+            self._list_func,
+            resource_version=self.resource_version,
+            timeout_seconds=self.watch_timeout,
+            allow_watch_bookmarks=True,
+            # install_policy leaves watches alone; the REST client only honours int timeouts.
+            _request_timeout=(10, int(self.watch_timeout) + WATCH_READ_SLACK),
+        )
+        for event in stream:
+            if self._stopped.is_set():
+                break
+            if event['type'] == 'BOOKMARK':
+                self.resource_version = event['raw_object']['metadata']['resourceVersion']
+                continue
+            obj = RawObject(event['raw_object']) if self._raw else event['object']
+            self._apply(event['type'], obj)
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                if self.resource_version is None:
+                    self._relist()
+                self._watch_once()
+            except ApiException as e:
+                if e.status != HTTP_GONE:
+                    self._fail(e)
+                self.resource_version = None
+            except Exception as e:
+                self._fail(e)
+                self.resource_version = None
+
+    def _fail(self, error):
+        # Stale data is worse than a slow read: stop serving until relisted.
+        self.error = error
+        self._synced.clear()
+        self._settled.set()
+        self._stopped.wait(self.retry_delay)
+
+
+class InformerCache:
+    """Lazily started informers for the resources the read handlers use."""
+
+    INDEXES = {
+        'replicasets': {'owner_uid': owner_uids},
+    }
+
+    def __init__(self, v1, apps_v1, sync_timeout=None, raw=False):
+        self._list_funcs = {
+            'pods': v1.list_pod_for_all_namespaces,
+            'nodes': v1.list_node,
+            'namespaces': v1.list_namespace,
+            'deployments': apps_v1.list_deployment_for_all_namespaces,
+            'replicasets': apps_v1.list_replica_set_for_all_namespaces,
+        }
+        self._informers = {}
+        self._health = None
+        self._lock = threading.Lock()
+        self.raw = raw
+        self.sync_timeout = sync_timeout if sync_timeout is not None else float(os.getenv('MCP_INFORMER_SYNC_TIMEOUT', '30'))
+
+    def informer(self, resource):
+        """Returns the synced informer for `resource`, or None if it is not usable right now.
+
+        Only the first list is waited for, at most `sync_timeout` seconds after
+        the informer started. Afterwards a failed or relisting informer is
+        skipped at once, so reads fall back to the API without delay.
+        """
+        with self._lock:
+            informer = self._start(resource)
+        return informer if self._wait(informer, informer.started_at + self.sync_timeout) else None
+
+    @staticmethod
+    def _wait(informer, until):
+        if informer.has_synced:
+            return True
+        if informer.error is not None:
+            return False
+        return informer.wait_for_first_list(max(until - time.monotonic(), 0))
+
+    def health(self):
+        """Returns the cluster's HealthMonitor, started on first use, or None until its informers have synced."""
+        with self._lock:
+            if self._health is None:
+                self._health = HealthMonitor()
+                for resource, kind in HealthMonitor.SOURCES.items():
+                    self._start(resource).add_handler(self._health.handler(kind))
+            monitor = self._health
+            informers = [self._start(resource) for resource in HealthMonitor.SOURCES]
+        # One shared wait for the three informers, not one sync_timeout each.
+        until = min(informer.started_at for informer in informers) + self.sync_timeout
+        return monitor if all(self._wait(informer, until) for informer in informers) else None
+
+    def _start(self, resource):
+        informer = self._informers.get(resource)
+        if informer is None:
+            informer = Informer(self._list_funcs[resource], raw=self.raw)
+            for name, func in self.INDEXES.get(resource, {}).items():
+                informer.add_index(name, func)
+            self._informers[resource] = informer
+            informer.start()
+        return informer
+
+    def stop(self):
+        with self._lock:
+            for informer in self._informers.values():
+                informer.stop()
+            self._informers.clear()
+            self._health = None
+
+
+class _CachedApi:
+    """Wraps a typed API object and answers the mapped read methods from informers.
+
+    Anything not in `_READS`, or called with arguments the store cannot honour,
+    goes to the wrapped API unchanged.
+    """
+
+    # method name -> (resource, scope) where scope is 'all', 'namespaced', 'read' or 'read_cluster'
+    _READS = {}
+
+    def __init__(self, api, cache):
+        self._api = api
+        self._cache = cache
+
+    def __getattr__(self, attr):
+        real = getattr(self._api, attr)
+        route = self._READS.get(attr)
+        if route is None:
+            return real
+
+        def read(*args, **kwargs):
+            served = self._serve(route, args, dict(kwargs))
+            return served if served is not None else real(*args, **kwargs)
+        return read
+
+    def _serve(self, route, args, kwargs):
+        resource, scope = route
+        args = list(args)
+        if scope == 'read':
+            name = args.pop(0) if args else kwargs.pop('name', None)
+            namespace = args.pop(0) if args else kwargs.pop('namespace', None)
+        elif scope == 'read_cluster':
+            name = args.pop(0) if args else kwargs.pop('name', None)
+            namespace = None
+        elif scope == 'namespaced':
+            namespace = args.pop(0) if args else kwargs.pop('namespace', None)
+        else:
+            namespace = None
+
+        try:
+            matches_labels = label_matcher(kwargs.pop('label_selector', None))
+            matches_fields = field_matcher(kwargs.pop('field_selector', None), resource)
+        except ValueError:
+            return None
+        if args or set(kwargs) - _PASSTHROUGH_KWARGS:
+            return None
+        informer = self._cache.informer(resource)
+        if informer is None:
+            return None
+
+        if scope in ('read', 'read_cluster'):
+            # A miss may just be watch lag on a freshly created object.
+            return informer.get(name, namespace)
+        return SimpleNamespace(
+            items=[obj for obj in informer.list(namespace) if matches_labels(obj) and matches_fields(obj)],
+            metadata=SimpleNamespace(_continue=None, resource_version=informer.resource_version),
+        )
+
+
+class CachedCoreV1Api(_CachedApi):
+    _READS = {
+        'list_pod_for_all_namespaces': ('pods', 'all'),
+        'list_namespaced_pod': ('pods', 'namespaced'),
+        'read_namespaced_pod': ('pods', 'read'),
+        'list_node': ('nodes', 'all'),
+        'read_node': ('nodes', 'read_cluster'),
+        'list_namespace': ('namespaces', 'all'),
+        'read_namespace': ('namespaces', 'read_cluster'),
+    }
+
+    def health_monitor(self):
+        """The cluster's incrementally updated HealthMonitor, or None if its informers are unavailable."""
+        return self._cache.health()
+
+
+class CachedAppsV1Api(_CachedApi):
+    _READS = {
+        'list_deployment_for_all_namespaces': ('deployments', 'all'),
+        'list_namespaced_deployment': ('deployments', 'namespaced'),
+        'read_namespaced_deployment': ('deployments', 'read'),
+        'list_replica_set_for_all_namespaces': ('replicasets', 'all'),
+        'list_namespaced_replica_set': ('replicasets', 'namespaced'),
+        'read_namespaced_replica_set': ('replicasets', 'read'),
+    }
+
+    def replica_sets_by_owner(self, owner_uid):
+        """ReplicaSets whose ownerReferences include `owner_uid`, or None if the store is unavailable."""
+        informer = self._cache.informer('replicasets')
+        return informer.by_index('owner_uid', owner_uid) if informer else None
@@ -0,0 +1,120 @@
+import re
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from kubernetes.watch.watch import iter_resp_lines
+from .resilience import with_current_deadline
+from .tracing import tracer
+
+DEFAULT_TAIL_LINES = 50
+MAX_LINES_PER_STREAM = 200
+MAX_STREAMS = 60
+MAX_WORKERS = 8
+
+
+class LogStream:
+    """The retained lines of one pod/container stream, bounded by a ring buffer."""
+
+    def __init__(self, pod, namespace, container, max_lines):
+        self.pod = pod
+        self.namespace = namespace
+        self.container = container
+        self.lines = deque(maxlen=max_lines)
+        self.matched = 0
+        self.error = None
+
+    @property
+    def dropped(self) -> int:
+        return self.matched - len(self.lines)
+
+
+def _compile(pattern):
+    if not pattern:
+        return None
+    try:
+        return re.compile(pattern)
+    except re.error:
+        return re.compile(re.escape(pattern))
+
+
+def _read(v1, stream, matcher, since_seconds, tail_lines, follow_seconds):
+    kwargs = {'container': stream.container, '_preload_content': False}
+    if since_seconds:
+        kwargs['since_seconds'] = int(since_seconds)
+    if tail_lines:
+        kwargs['tail_lines'] = int(tail_lines)
+    deadline = None
+    if follow_seconds:
+        kwargs['follow'] = True
+        kwargs['_request_timeout'] = (10, float(follow_seconds))
+        deadline = time.monotonic() + float(follow_seconds)
+
+    try:
+        resp = v1.read_namespaced_pod_log(name=stream.pod, namespace=stream.namespace, **kwargs)
+    except Exception as e:
+        stream.error = e
+        return stream
+
+    try:
+        for line in iter_resp_lines(resp):
+            if matcher is None or matcher.search(line):
+                stream.lines.append(line)
+                stream.matched += 1
+            if deadline and time.monotonic() > deadline:
+                break
+    except Exception as e:
+        # A follow read ends on its read timeout; anything else is reported.
+        if not deadline:
+            stream.error = e
+    finally:
+        resp.close()
+        resp.release_conn()
+    return stream
+
+
+def collect_logs(v1, targets, since_seconds=None, tail_lines=None, pattern=None, follow_seconds=None,
+                 max_lines=None, max_workers=MAX_WORKERS):
+    """Fetches the logs of every (pod, namespace, container) target concurrently.
+
+    Lines are filtered on the fly by `pattern` (a regex, or a literal if it does
+    not compile) and only the last `max_lines` matches of each stream are kept.
+    """
+    if not since_seconds and not tail_lines:
+        tail_lines = DEFAULT_TAIL_LINES
+    max_lines = max_lines or (min(int(tail_lines), MAX_LINES_PER_STREAM) if tail_lines else MAX_LINES_PER_STREAM)
+    matcher = _compile(pattern)
+
+    streams = [LogStream(pod, namespace, container, max_lines) for pod, namespace, container in targets[:MAX_STREAMS]]
+    if not streams:
+        return []
+    read = with_current_deadline(tracer.bind(
+        lambda stream: _read(v1, stream, matcher, since_seconds, tail_lines, follow_seconds)))
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(streams))) as pool:
+        return list(pool.map(read, streams))
+
+
+def pod_targets(pods, container=None):
+    """(pod, namespace, container) targets for all containers of `pods`, or only `container`."""
+    targets = []
+    for pod in pods:
+        for c in pod.spec.containers:
+            if container is None or c.name == container:
+                targets.append((pod.metadata.name, pod.metadata.namespace, c.name))
+    return targets
+
+
+def format_streams(streams, skipped=0):
+    output = []
+    for stream in streams:
+        output.append(f"Logs pour le pod '{stream.pod}' (conteneur: {stream.container}):\n")
+        output.append("--------------------------------------------------\n")
+        if stream.error:
+            output.append(f"Erreur: {stream.error}\n")
+        if stream.dropped:
+            output.append(f"[... {stream.dropped} lignes plus anciennes omises]\n")
+        if stream.lines:
+            output.append("\n".join(stream.lines) + "\n")
+        output.append("--------------------------------------------------\n")
+    if skipped:
+        output.append(f"[{skipped} flux non lus: limite de {MAX_STREAMS} flux atteinte]\n")
+    return "".join(output).rstrip("\n")
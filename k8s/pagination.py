@@ -0,0 +1,21 @@
+from .tracing import tracer
+
+DEFAULT_PAGE_SIZE = 500
+
+def iter_items(list_func, *args, page_size=DEFAULT_PAGE_SIZE, **kwargs):
+    """Yields the items of a list call page by page, following `_continue` tokens.
+
+    None-valued kwargs (e.g. an unset label_selector) are dropped, so handlers
+    can forward optional selectors as-is.
+    """
+    kwargs = {k: v for k, v in kwargs.items() if v is not None}
+    token = None
+    while True:
+        if token:
+            kwargs['_continue'] = token
+        page = list_func(*args, limit=page_size, **kwargs)
+        tracer.count('objects', len(page.items))
+        yield from page.items
+        token = getattr(page.metadata, '_continue', None)
+        if not token:
+            return
@@ -0,0 +1,205 @@
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from kubernetes.client.rest import ApiException
+from urllib3.exceptions import HTTPError
+
+# Timeout (s) of a single API request when its handler has no tighter deadline.
+REQUEST_TIMEOUT = float(os.getenv('MCP_API_TIMEOUT', '30'))
+# Total budget (s) of one handler call, per verb; follow/wait durations are added on top.
+VERB_DEADLINES = {'get': 30, 'describe': 15, 'history': 15, 'logs': 60, 'check': 60}
+MUTATION_DEADLINE = 60
+VERB_DEADLINES.update({
+    verb: float(seconds) for verb, _, seconds in
+    (item.partition('=') for item in os.getenv('MCP_VERB_DEADLINES', '').split(',') if '=' in item)
+})
+
+MAX_ATTEMPTS = int(os.getenv('MCP_RETRY_ATTEMPTS', '3'))
+BACKOFF_BASE = 0.2
+BACKOFF_CAP = 5.0
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+BREAKER_THRESHOLD = int(os.getenv('MCP_BREAKER_THRESHOLD', '5'))
+BREAKER_COOLDOWN = float(os.getenv('MCP_BREAKER_COOLDOWN', '30'))
+
+
+class DeadlineExceeded(Exception):
+    pass
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+_local = threading.local()
+
+
+@contextmanager
+def deadline(seconds):
+    """Bounds the calls made by this thread inside the block to `seconds` in total (nested deadlines keep the tightest)."""
+    previous = getattr(_local, 'deadline', None)
+    end = time.monotonic() + seconds
+    _local.deadline = min(end, previous) if previous else end
+    try:
+        yield
+    finally:
+        _local.deadline = previous
+
+
+def with_current_deadline(func):
+    """Wraps `func` to run under the calling thread's deadline in whichever thread calls it (pool workers)."""
+    end = getattr(_local, 'deadline', None)
+    if end is None:
+        return func
+
+    def bound(*args, **kwargs):
+        previous = getattr(_local, 'deadline', None)
+        _local.deadline = min(end, previous) if previous else end
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _local.deadline = previous
+    return bound
+
+
+def remaining():
+    """Seconds left before this thread's deadline, or None without one."""
+    end = getattr(_local, 'deadline', None)
+    return None if end is None else end - time.monotonic()
+
+
+def verb_deadline(verb, follow_seconds=None, wait_seconds=None, default_wait=0):
+    base = VERB_DEADLINES.get(verb, MUTATION_DEADLINE)
+    wait = default_wait if wait_seconds is None else int(wait_seconds)
+    return base + int(follow_seconds or 0) + max(wait, 0)
+
+
+def backoff(attempt):
+    """Full-jitter exponential backoff for the `attempt`-th retry (1-based)."""
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+
+class CircuitBreaker:
+    """Fails fast once `threshold` calls in a row failed, for `cooldown` seconds.
+
+    After the cooldown one trial call goes through (half-open); its success
+    closes the circuit, its failure opens it again.
+    """
+
+    def __init__(self, name, threshold=BREAKER_THRESHOLD, cooldown=BREAKER_COOLDOWN):
+        self.name = name
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return 'closed'
+        return 'half-open' if time.monotonic() - self.opened_at >= self.cooldown else 'open'
+
+    def before(self):
+        with self._lock:
+            state = self.state
+            if state == 'closed':
+                return
+            if state == 'half-open' and not self._trial:
+                self._trial = True
+                return
+            retry_in = max(self.cooldown - (time.monotonic() - self.opened_at), 0)
+            raise CircuitOpenError(
+                f"'{self.name}' ne répond pas ({self.failures} échecs consécutifs) ; "
+                f"appels suspendus, nouvel essai dans {retry_in:.0f} s."
+            )
+
+    def record(self, success):
+        with self._lock:
+            self._trial = False
+            if success:
+                self.failures = 0
+                self.opened_at = None
+                return
+            self.failures += 1
+            if self.failures >= self.threshold or self.opened_at is not None:
+                self.opened_at = time.monotonic()
+
+
+def call(func, transient, breaker=None, idempotent=True, attempts=MAX_ATTEMPTS):
+    """Calls `func()` under the thread's deadline, retrying transient failures of idempotent calls.
+
+    `transient(exc)` returns None for a permanent error, otherwise the delay
+    the server asked for (Retry-After) or 0. Permanent errors count as a
+    healthy answer for the breaker; exhausted retries count as a failure.
+    """
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceeded("délai dépassé avant la fin de l'appel")
+    if breaker:
+        breaker.before()
+    for attempt in range(1, attempts + 1):
+        try:
+            result = func()
+        except Exception as e:
+            requested = transient(e)
+            if requested is None:
+                if breaker:
+                    breaker.record(True)
+                raise
+            delay = max(requested, backoff(attempt))
+            left = remaining()
+            if not idempotent or attempt == attempts or (left is not None and delay >= left):
+                if breaker:
+                    breaker.record(False)
+                raise
+            time.sleep(delay)
+        else:
+            if breaker:
+                breaker.record(True)
+            return result
+
+
+def retry_after(headers):
+    try:
+        return float((headers or {}).get('Retry-After') or 0)
+    except (TypeError, ValueError):
+        return 0.0  # HTTP-date form: fall back to backoff.
+
+
+def api_transient(e):
+    """Retry policy for Kubernetes API calls: 429/5xx and network errors."""
+    if isinstance(e, ApiException):
+        return retry_after(e.headers) if e.status in RETRYABLE_STATUSES else None
+    if isinstance(e, HTTPError):
+        return 0.0
+    return None
+
+
+def install_policy(api_client, breaker):
+    """Applies timeouts, retries and `breaker` to every request of `api_client` except watches and log follows."""
+    rest = api_client.rest_client
+    request = rest.request
+    # urllib3 would otherwise retry each attempt on its own, multiplying the timeouts.
+    rest.pool_manager.connection_pool_kw['retries'] = 0
+
+    def guarded_request(method, url, query_params=None, **kwargs):
+        if query_params and any(key in ('watch', 'follow') and value for key, value in query_params):
+            return request(method, url, query_params=query_params, **kwargs)
+
+        def attempt():
+            timeout = kwargs.get('_request_timeout') or REQUEST_TIMEOUT
+            if not isinstance(timeout, tuple):
+                left = remaining()
+                if left is not None:
+                    timeout = max(min(timeout, left), 0.1)
+                # The REST client ignores float timeouts; a (connect, read) pair accepts them.
+                timeout = (timeout, timeout)
+            return request(method, url, query_params=query_params, **dict(kwargs, _request_timeout=timeout))
+
+        return call(attempt, api_transient, breaker, idempotent=method in ('GET', 'HEAD'))
+
+    rest.request = guarded_request
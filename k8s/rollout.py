@@ -0,0 +1,121 @@
+import os
+import time
+from kubernetes import watch
+from kubernetes.client.rest import ApiException
+from urllib3.exceptions import HTTPError
+
+# Default wait (s) after restart/scale/undo/deploy; 0 returns as soon as the change is submitted.
+DEFAULT_WAIT_SECONDS = int(os.getenv('MCP_ROLLOUT_WAIT_SECONDS', '120'))
+
+
+def rollout_state(deployment):
+    """Returns (done, failed, message) for a deployment, following `kubectl rollout status`."""
+    spec, status = deployment.spec, deployment.status
+    desired = spec.replicas if spec.replicas is not None else 1
+    updated = status.updated_replicas or 0
+    total = status.replicas or 0
+    available = status.available_replicas or 0
+
+    if (status.observed_generation or 0) < (deployment.metadata.generation or 0):
+        return False, False, "en attente de la prise en compte par le contrôleur"
+    for condition in status.conditions or []:
+        if condition.type == 'Progressing' and condition.reason == 'ProgressDeadlineExceeded':
+            return False, True, f"délai de progression dépassé ({condition.message})"
+    if updated < desired:
+        return False, False, f"{updated}/{desired} réplicas mis à jour"
+    if total > updated:
+        return False, False, f"{total - updated} ancien(s) réplica(s) en cours d'arrêt"
+    if available < updated:
+        return False, False, f"{available}/{updated} réplicas disponibles"
+    return True, False, f"rollout terminé ({available}/{desired} réplicas disponibles)"
+
+
+class RolloutWatch:
+    """Progress of one deployment rollout: the current state plus a timeline of its changes."""
+
+    def __init__(self, name, namespace):
+        self.name = name
+        self.namespace = namespace
+        self.start = time.monotonic()
+        self.timeline = []
+        self.done = False
+        self.failed = False
+        self.message = "état inconnu"
+        self._last = None
+
+    @property
+    def finished(self):
+        return self.done or self.failed
+
+    def observe(self, deployment):
+        status = deployment.status
+        counts = (status.updated_replicas or 0, status.ready_replicas or 0,
+                  status.available_replicas or 0, status.replicas or 0)
+        self.done, self.failed, self.message = rollout_state(deployment)
+        if (counts, self.message) != self._last:
+            self._last = (counts, self.message)
+            self.timeline.append((time.monotonic() - self.start, counts, self.message))
+
+    def fail(self, message):
+        self.failed, self.message = True, message
+        self.timeline.append((time.monotonic() - self.start, self._last[0] if self._last else None, message))
+
+    def __str__(self):
+        elapsed = time.monotonic() - self.start
+        if self.done:
+            head = f"Rollout de '{self.name}' terminé en {elapsed:.1f} s : {self.message}."
+        elif self.failed:
+            head = f"Rollout de '{self.name}' en échec après {elapsed:.1f} s : {self.message}."
+        else:
+            head = f"Rollout de '{self.name}' toujours en cours après {elapsed:.1f} s : {self.message}."
+        lines = [head, "Chronologie (à jour / prêts / disponibles / total):"]
+        for offset, counts, message in self.timeline:
+            numbers = " / ".join(str(n) for n in counts) if counts else "-"
+            lines.append(f"  +{offset:5.1f}s  {numbers:<16} {message}")
+        return "\n".join(lines)
+
+
+def wait_for_rollout(apps_v1, name, namespace, timeout=DEFAULT_WAIT_SECONDS):
+    """Watches deployment `name` until its rollout converges, fails or `timeout` seconds pass.
+
+    Only this deployment is watched (field selector on its name); its status
+    already aggregates the replica counts of its ReplicaSets.
+    """
+    progress = RolloutWatch(name, namespace)
+    deadline = progress.start + timeout
+    selector = f"metadata.name={name}"
+
+    def relist():
+        page = apps_v1.list_namespaced_deployment(namespace, field_selector=selector)
+        if not page.items:
+            progress.fail("déploiement introuvable")
+        else:
+            progress.observe(page.items[0])
+        return page.metadata.resource_version
+
+    resource_version = relist()
+    w = watch.Watch()
+    try:
+        while not progress.finished and (remaining := deadline - time.monotonic()) > 0:
+            try:
+                # The REST client ignores a float timeout; a (connect, read) pair is honoured.
+                for event in w.stream(apps_v1.list_namespaced_deployment, namespace, field_selector=selector,
+                                      resource_version=resource_version, timeout_seconds=max(int(remaining), 1),
+                                      _request_timeout=(10, remaining + 5)):
+                    if event['type'] == 'DELETED':
+                        progress.fail("déploiement supprimé pendant le rollout")
+                    elif event['type'] in ('ADDED', 'MODIFIED'):
+                        resource_version = event['object'].metadata.resource_version
+                        progress.observe(event['object'])
+                    if progress.finished or time.monotonic() >= deadline:
+                        break
+            except ApiException as e:
+                if e.status != 410:
+                    raise
+                resource_version = relist()
+            except HTTPError:
+                # Dropped or timed-out watch connection: retry until the deadline.
+                time.sleep(min(1.0, max(deadline - time.monotonic(), 0)))
+    finally:
+        w.stop()
+    return progress
@@ -1,5 +1,14 @@
+from .informer import CachedCoreV1Api, CachedAppsV1Api
+from .fastread import RawReadApi
+from .tracing import HANDLER, tracer
+from .resilience import deadline, verb_deadline
+from .rollout import DEFAULT_WAIT_SECONDS
+
 HANDLER_REGISTRY = {}
 
+# Verbs that never modify the cluster and can be answered from the informer store.
+READ_VERBS = {'get', 'describe', 'history', 'logs', 'check'}
+
 def register_handler(verb, resource):
     """A decorator to register a handler function for a specific verb and resource."""
     def decorator(func):
@@ -11,9 +20,18 @@ def dispatch(verb, resource, **kwargs):
     """Finds and executes the appropriate handler from the registry."""
     v1 = kwargs.pop('v1', None)
     apps_v1 = kwargs.pop('apps_v1', None)
+    informers = kwargs.pop('informers', None)
+    fast_read = kwargs.pop('fast_read', False)
 
     handler_kwargs = {k: v for k, v in kwargs.items() if v is not None}
 
+    if fast_read and verb in READ_VERBS:
+        v1 = RawReadApi(v1) if v1 else None
+        apps_v1 = RawReadApi(apps_v1) if apps_v1 else None
+    if informers and verb in READ_VERBS:
+        v1 = CachedCoreV1Api(v1, informers) if v1 else None
+        apps_v1 = CachedAppsV1Api(apps_v1, informers) if apps_v1 else None
+
     if v1:
         handler_kwargs['v1'] = v1
     if apps_v1:
@@ -21,6 +39,11 @@ def dispatch(verb, resource, **kwargs):
 
     handler = HANDLER_REGISTRY.get((verb, resource))
     if handler:
-        return handler(**handler_kwargs)
+        budget = verb_deadline(verb, kwargs.get('follow_seconds'), kwargs.get('wait_seconds'),
+                               default_wait=0 if verb in READ_VERBS else DEFAULT_WAIT_SECONDS)
+        with deadline(budget), tracer.span(HANDLER, f"{verb} {resource}", informers=bool(informers)) as span:
+            result = handler(**handler_kwargs)
+            span.set(bytes=len(result) if isinstance(result, str) else None)
+            return result
     else:
         return f"Erreur: Combinaison non supportée: {verb} {resource}."
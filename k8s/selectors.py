@@ -0,0 +1,83 @@
+import re
+
+# Field paths the local store can evaluate, mapped to accessors on typed objects.
+FIELD_GETTERS = {
+    'metadata.name': lambda obj: obj.metadata.name,
+    'metadata.namespace': lambda obj: obj.metadata.namespace,
+    'status.phase': lambda obj: obj.status.phase,
+    'spec.nodeName': lambda obj: obj.spec.node_name,
+}
+# Fields each resource actually has; other resources only have the metadata ones.
+METADATA_FIELDS = {'metadata.name', 'metadata.namespace'}
+RESOURCE_FIELDS = {
+    'pods': METADATA_FIELDS | {'status.phase', 'spec.nodeName'},
+    'namespaces': METADATA_FIELDS | {'status.phase'},
+}
+
+_SPLIT = re.compile(r',(?![^()]*\))')
+_SET_TERM = re.compile(r'^([^\s!=]+)\s+(in|notin)\s+\(([^)]*)\)$')
+_EQ_TERM = re.compile(r'^([^\s!=]+)\s*(==|=|!=)\s*([^\s,]*)$')
+_EXISTS_TERM = re.compile(r'^(!?)([^\s!=(),]+)$')
+
+
+def selector_string(selector) -> str:
+    """Renders a V1LabelSelector as a label_selector query string."""
+    terms = [f"{k}={v}" for k, v in (selector.match_labels or {}).items()]
+    for expr in selector.match_expressions or []:
+        if expr.operator == 'In':
+            terms.append(f"{expr.key} in ({','.join(expr.values)})")
+        elif expr.operator == 'NotIn':
+            terms.append(f"{expr.key} notin ({','.join(expr.values)})")
+        elif expr.operator == 'Exists':
+            terms.append(expr.key)
+        elif expr.operator == 'DoesNotExist':
+            terms.append(f"!{expr.key}")
+    return ','.join(terms)
+
+
+def _terms(selector):
+    return [term.strip() for term in _SPLIT.split(selector or '') if term.strip()]
+
+
+def label_matcher(selector):
+    """Compiles a label selector string into a predicate on an object. Raises ValueError if unparseable."""
+    checks = []
+    for term in _terms(selector):
+        if m := _SET_TERM.match(term):
+            key, op, values = m.group(1), m.group(2), {v.strip() for v in m.group(3).split(',')}
+            if op == 'in':
+                checks.append(lambda labels, k=key, vs=values: labels.get(k) in vs)
+            else:
+                checks.append(lambda labels, k=key, vs=values: labels.get(k) not in vs)
+        elif m := _EQ_TERM.match(term):
+            key, op, value = m.groups()
+            if op == '!=':
+                checks.append(lambda labels, k=key, v=value: labels.get(k) != v)
+            else:
+                checks.append(lambda labels, k=key, v=value: labels.get(k) == v)
+        elif m := _EXISTS_TERM.match(term):
+            negate, key = m.groups()
+            checks.append(lambda labels, k=key, neg=bool(negate): (k in labels) != neg)
+        else:
+            raise ValueError(f"Sélecteur de labels invalide: {term}")
+    return lambda obj: all(check(obj.metadata.labels or {}) for check in checks)
+
+
+def field_matcher(selector, resource=None):
+    """Compiles a field selector string into a predicate. Raises ValueError for fields the store cannot evaluate.
+
+    With `resource`, only the fields that resource has are accepted.
+    """
+    fields = RESOURCE_FIELDS.get(resource, METADATA_FIELDS) if resource else FIELD_GETTERS
+    checks = []
+    for term in _terms(selector):
+        m = _EQ_TERM.match(term)
+        if not m or m.group(1) not in fields:
+            raise ValueError(f"Sélecteur de champs non supporté localement: {term}")
+        path, op, value = m.groups()
+        getter = FIELD_GETTERS[path]
+        if op == '!=':
+            checks.append(lambda obj, g=getter, v=value: (g(obj) or '') != v)
+        else:
+            checks.append(lambda obj, g=getter, v=value: (g(obj) or '') == v)
+    return lambda obj: all(check(obj) for check in checks)
@@ -0,0 +1,185 @@
+import heapq
+import os
+from collections import Counter
+from itertools import count
+
+# Above either threshold, list handlers answer with a summary instead of one line per object.
+MAX_OBJECTS = int(os.getenv('MCP_SUMMARY_MAX_OBJECTS', '200'))
+MAX_BYTES = int(os.getenv('MCP_SUMMARY_MAX_BYTES', '20000'))
+TOP_N = int(os.getenv('MCP_SUMMARY_TOP', '10'))
+
+OUTPUT_MODES = {None, 'auto', 'full', 'summary'}
+RESTART_BUCKETS = [(0, '0'), (5, '1-5'), (20, '6-20'), (None, '>20')]
+
+
+def pod_counts(pod):
+    """Returns (ready containers, containers, restarts) of a pod."""
+    statuses = pod.status.container_statuses or []
+    return sum(1 for s in statuses if s.ready), len(pod.spec.containers), sum(s.restart_count or 0 for s in statuses)
+
+
+def restart_bucket(restarts):
+    return next(label for limit, label in RESTART_BUCKETS if limit is None or restarts <= limit)
+
+
+def table(headers, rows, indent="  "):
+    """Left-aligned columns sized to their content."""
+    widths = [max(len(str(cell)) for cell in column) for column in zip(headers, *rows)]
+    return [indent + "  ".join(str(cell).ljust(width) for cell, width in zip(row, widths)).rstrip()
+            for row in [headers, *rows]]
+
+
+class _TopN:
+    """The `n` items with the largest keys seen so far, in O(log n) per item."""
+
+    def __init__(self, n):
+        self.n = n
+        self._heap = []
+        self._tiebreak = count()
+
+    def add(self, key, item):
+        entry = (key, next(self._tiebreak), item)
+        if len(self._heap) < self.n:
+            heapq.heappush(self._heap, entry)
+        elif entry > self._heap[0]:
+            heapq.heapreplace(self._heap, entry)
+
+    def items(self):
+        return [item for _, _, item in sorted(self._heap, reverse=True)]
+
+
+class PodSummary:
+    """Counts pods by namespace, phase, readiness and restart bucket in one pass."""
+
+    def __init__(self, title="Pods", top=TOP_N):
+        self.title = title
+        self.top = top
+        self.total = 0
+        self.phases = Counter()
+        self.not_ready = 0
+        self.restart_buckets = Counter()
+        self.namespaces = {}
+        self.offenders = _TopN(top)
+
+    def add(self, pod):
+        ready, containers, restarts = pod_counts(pod)
+        phase = pod.status.phase or 'Inconnu'
+        is_ready = phase == 'Succeeded' or (phase == 'Running' and ready == containers)
+        self.total += 1
+        self.phases[phase] += 1
+        self.restart_buckets[restart_bucket(restarts)] += 1
+        ns = self.namespaces.setdefault(pod.metadata.namespace, [0, 0, 0])
+        ns[0] += 1
+        ns[1] += not is_ready
+        ns[2] += restarts
+        if not is_ready:
+            self.not_ready += 1
+        if restarts or not is_ready:
+            self.offenders.add((not is_ready, restarts),
+                               (pod.metadata.namespace, pod.metadata.name, phase, f"{ready}/{containers}", restarts))
+
+    def render(self):
+        lines = [
+            f"{self.title}: {self.total} (résumé ; output='full' pour la liste complète)",
+            "  Phases: " + " | ".join(f"{phase} {n}" for phase, n in self.phases.most_common()),
+            f"  Prêts: {self.total - self.not_ready} | Non prêts: {self.not_ready}",
+            "  Redémarrages: " + " | ".join(f"{label}: {self.restart_buckets[label]}" for _, label in RESTART_BUCKETS),
+        ]
+        namespaces = sorted(self.namespaces.items(), key=lambda kv: (-kv[1][1], -kv[1][0], kv[0]))
+        lines.append(f"  Par namespace ({min(self.top, len(namespaces))} sur {len(namespaces)}):")
+        lines += table(["NAMESPACE", "PODS", "NON PRÊTS", "REDÉMARRAGES"],
+                       [(ns, *values) for ns, values in namespaces[:self.top]], indent="    ")
+        offenders = self.offenders.items()
+        if offenders:
+            lines.append(f"  Top {len(offenders)} (non prêts, puis redémarrages):")
+            lines += table(["NAMESPACE", "NOM", "PHASE", "PRÊTS", "REDÉMARRAGES"], offenders, indent="    ")
+        return "\n".join(lines)
+
+
+class DeploymentSummary:
+    """Counts deployments by namespace and availability in one pass."""
+
+    def __init__(self, title="Déploiements", top=TOP_N):
+        self.title = title
+        self.top = top
+        self.total = 0
+        self.degraded = 0
+        self.desired = 0
+        self.available = 0
+        self.namespaces = {}
+        self.offenders = _TopN(top)
+
+    def add(self, deployment):
+        desired = deployment.spec.replicas or 0
+        available = deployment.status.available_replicas or 0
+        missing = max(desired - available, 0)
+        self.total += 1
+        self.desired += desired
+        self.available += available
+        ns = self.namespaces.setdefault(deployment.metadata.namespace, [0, 0])
+        ns[0] += 1
+        if missing:
+            self.degraded += 1
+            ns[1] += 1
+            self.offenders.add(missing, (deployment.metadata.namespace, deployment.metadata.name, f"{available}/{desired}"))
+
+    def render(self):
+        lines = [
+            f"{self.title}: {self.total} (résumé ; output='full' pour la liste complète)",
+            f"  Complets: {self.total - self.degraded} | Dégradés: {self.degraded}"
+            f" | Réplicas disponibles: {self.available}/{self.desired}",
+        ]
+        namespaces = sorted(self.namespaces.items(), key=lambda kv: (-kv[1][1], -kv[1][0], kv[0]))
+        lines.append(f"  Par namespace ({min(self.top, len(namespaces))} sur {len(namespaces)}):")
+        lines += table(["NAMESPACE", "DÉPLOIEMENTS", "DÉGRADÉS"],
+                       [(ns, *values) for ns, values in namespaces[:self.top]], indent="    ")
+        offenders = self.offenders.items()
+        if offenders:
+            lines.append(f"  Top {len(offenders)} (réplicas manquants):")
+            lines += table(["NAMESPACE", "NOM", "DISPONIBLES"], offenders, indent="    ")
+        return "\n".join(lines)
+
+
+class Collector:
+    """Feeds every object to a summary and keeps full output lines until a threshold is crossed.
+
+    `output` is 'full' (always list), 'summary' (never list) or None/'auto'
+    (list while under MAX_OBJECTS objects and MAX_BYTES of text).
+    """
+
+    def __init__(self, summary, output=None, max_objects=MAX_OBJECTS, max_bytes=MAX_BYTES):
+        if output not in OUTPUT_MODES:
+            raise ValueError(f"output doit valoir 'auto', 'full' ou 'summary', pas '{output}'.")
+        self.summary = summary
+        self.output = output
+        self.max_objects = max_objects
+        self.max_bytes = max_bytes
+        self.lines = None if output == 'summary' else []
+        self._bytes = 0
+
+    def add(self, item, line=None):
+        """Counts `item`; `line` (if any) is its entry in the full output.
+
+        `line` may be a callable `line(item)`, only called while the full output
+        is still kept, so summarized results never format their lines.
+        """
+        self.summary.add(item)
+        if self.lines is None or line is None:
+            return
+        if callable(line):
+            line = line(item)
+        self.lines.append(line)
+        self._bytes += len(line)
+        if self.output != 'full' and (len(self.lines) > self.max_objects or self._bytes > self.max_bytes):
+            self.lines = None
+
+    @property
+    def summarized(self):
+        return self.lines is None
+
+    def render(self, header, empty):
+        if self.summary.total == 0:
+            return empty
+        if self.summarized:
+            return self.summary.render()
+        return header + "".join(self.lines)
@@ -0,0 +1,254 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+# Span kinds, outermost first.
+LLM, HANDLER, API = 'llm', 'handler', 'api'
+
+
+class Span:
+    __slots__ = ('kind', 'name', 'turn', 'start', 'duration', 'attrs')
+
+    def __init__(self, kind, name, turn, attrs):
+        self.kind = kind
+        self.name = name
+        self.turn = turn
+        self.start = time.time()
+        self.duration = 0.0
+        self.attrs = attrs
+
+    def set(self, **attrs):
+        self.attrs.update({k: v for k, v in attrs.items() if v is not None})
+
+    def add(self, key, value=1):
+        self.attrs[key] = self.attrs.get(key, 0) + value
+
+    def to_dict(self):
+        return {'kind': self.kind, 'name': self.name, 'turn': self.turn, 'start': self.start,
+                'duration_ms': round(self.duration * 1000, 3), **self.attrs}
+
+
+class _Aggregate:
+    __slots__ = ('count', 'total', 'max', 'sums', 'counts')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.sums = {}
+        # Spans that carried each attribute, for the averages of latency attributes.
+        self.counts = {}
+
+
+def is_latency(key):
+    """Attributes such as `first_chunk_ms` are latencies: averaged, never added up."""
+    return key.endswith('_ms')
+
+
+class Tracer:
+    """Records timed spans for LLM calls, handler dispatches and API requests.
+
+    Finished spans are kept in a bounded buffer, folded into per-(kind, name)
+    aggregates and, if `MCP_TRACE_FILE` is set, appended to it as JSON lines.
+    Handlers add their own numbers with `count()`, which lands on the current
+    span and in the global counters. Spans belong to the turn started in their
+    thread (`start_turn()`), so concurrent sessions do not mix; pool workers
+    inherit the spans and turn of the submitting thread through `bind()`.
+    """
+
+    def __init__(self, max_spans=5000, trace_file=None):
+        self.spans = deque(maxlen=max_spans)
+        self.counters = {}
+        self.turn = 0
+        self.trace_file = trace_file
+        self._aggregates = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def start_turn(self):
+        """Starts a new turn for this thread; `turn` is the last turn started by any thread."""
+        with self._lock:
+            self.turn += 1
+            self._local.turn = self.turn
+        return self.turn
+
+    @property
+    def current_turn(self):
+        turn = getattr(self._local, 'turn', None)
+        return self.turn if turn is None else turn
+
+    @property
+    def current(self):
+        stack = getattr(self._local, 'stack', None)
+        return stack[-1] if stack else None
+
+    def bind(self, func):
+        """Wraps `func` to run under the calling thread's spans and turn in whichever thread calls it (pool workers)."""
+        stack = tuple(getattr(self._local, 'stack', ()))
+        turn = getattr(self._local, 'turn', None)
+
+        def bound(*args, **kwargs):
+            previous = self._local.__dict__.copy()
+            self._local.stack, self._local.turn = list(stack), turn
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._local.__dict__.clear()
+                self._local.__dict__.update(previous)
+        return bound
+
+    @contextmanager
+    def span(self, kind, name, **attrs):
+        span = Span(kind, name, self.current_turn, {k: v for k, v in attrs.items() if v is not None})
+        stack = self._local.__dict__.setdefault('stack', [])
+        stack.append(span)
+        start = time.perf_counter()
+        try:
+            yield span
+        except Exception as e:
+            span.set(error=type(e).__name__)
+            raise
+        finally:
+            span.duration = time.perf_counter() - start
+            stack.pop()
+            self._record(span)
+
+    def count(self, name, value=1):
+        """Adds `value` to counter `name`, globally and on the current span."""
+        span = self.current
+        with self._lock:
+            if span is not None:
+                span.add(name, value)
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def count_parent(self, kind, name, value=1):
+        """Adds `value` to `name` on the innermost enclosing span of `kind`, if any (it may be shared by workers)."""
+        for span in reversed(getattr(self._local, 'stack', [])[:-1]):
+            if span.kind == kind:
+                with self._lock:
+                    span.add(name, value)
+                return
+
+    def _record(self, span):
+        with self._lock:
+            self.spans.append(span)
+            aggregate = self._aggregates.setdefault((span.kind, span.name), _Aggregate())
+            aggregate.count += 1
+            aggregate.total += span.duration
+            aggregate.max = max(aggregate.max, span.duration)
+            for key, value in span.attrs.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    aggregate.sums[key] = aggregate.sums.get(key, 0) + value
+                    aggregate.counts[key] = aggregate.counts.get(key, 0) + 1
+        if self.trace_file:
+            with self._lock, open(self.trace_file, 'a') as f:
+                f.write(json.dumps(span.to_dict(), default=str) + '\n')
+
+    def turn_spans(self, turn=None):
+        turn = self.current_turn if turn is None else turn
+        with self._lock:
+            return [span for span in self.spans if span.turn == turn]
+
+    def summary(self) -> str:
+        """Human-readable aggregates and the breakdown of the last turn."""
+        lines = ["Métriques cumulées:", f"  {'TYPE':<8} {'NOM':<44} {'N':>5} {'TOTAL ms':>10} {'MOY ms':>9} {'MAX ms':>9}  DÉTAILS"]
+        with self._lock:
+            aggregates = sorted(self._aggregates.items())
+        for (kind, name), agg in aggregates:
+            details = ", ".join(f"{k}=moy {v / agg.counts[k]:.1f}" if is_latency(k) else f"{k}={v}"
+                                for k, v in sorted(agg.sums.items()))
+            lines.append(f"  {kind:<8} {name[:44]:<44} {agg.count:>5} {agg.total * 1000:>10.1f} "
+                         f"{agg.total / agg.count * 1000:>9.1f} {agg.max * 1000:>9.1f}  {details}")
+
+        spans = self.turn_spans()
+        if spans:
+            lines.append(f"Dernier tour (#{self.current_turn}):")
+            for kind in (LLM, HANDLER, API):
+                of_kind = [span for span in spans if span.kind == kind]
+                if of_kind:
+                    total = sum(span.duration for span in of_kind) * 1000
+                    lines.append(f"  {kind:<8} {len(of_kind):>3} appels, {total:.1f} ms")
+        if self.counters:
+            lines.append("Compteurs: " + ", ".join(f"{k}={v}" for k, v in sorted(self.counters.items())))
+        return "\n".join(lines)
+
+    def prometheus_text(self) -> str:
+        """Aggregates in the Prometheus text exposition format, with HELP and TYPE for every family.
+
+        Numeric span attributes become counters (`mcp_span_<attr>_total`),
+        except latencies (`*_ms`), exported as `mcp_span_<attr>_seconds` summaries.
+        """
+        families = {}
+
+        def sample(family, kind, help_text, line):
+            families.setdefault(family, (kind, help_text, []))[2].append(line)
+
+        with self._lock:
+            aggregates = sorted(self._aggregates.items())
+            counters = sorted(self.counters.items())
+        for (kind, name), agg in aggregates:
+            labels = f'kind="{kind}",name="{name}"'
+            help_text = "Durée des spans (appels LLM, handlers, requêtes API)."
+            sample("mcp_span_seconds", "summary", help_text, f"mcp_span_seconds_count{{{labels}}} {agg.count}")
+            sample("mcp_span_seconds", "summary", help_text, f"mcp_span_seconds_sum{{{labels}}} {agg.total:.6f}")
+            for key, value in sorted(agg.sums.items()):
+                if is_latency(key):
+                    family = f"mcp_span_{key[:-3]}_seconds"
+                    help_text = f"Latence '{key}' des spans, en secondes."
+                    sample(family, "summary", help_text, f"{family}_count{{{labels}}} {agg.counts[key]}")
+                    sample(family, "summary", help_text, f"{family}_sum{{{labels}}} {value / 1000:.6f}")
+                else:
+                    family = f"mcp_span_{key}_total"
+                    sample(family, "counter", f"Cumul de '{key}' sur les spans.", f"{family}{{{labels}}} {value}")
+        for name, value in counters:
+            family = f"mcp_{name}_total"
+            sample(family, "counter", f"Compteur global '{name}'.", f"{family} {value}")
+
+        out = []
+        for family, (kind, help_text, lines) in families.items():
+            out += [f"# HELP {family} {help_text}", f"# TYPE {family} {kind}", *lines]
+        return "\n".join(out) + "\n"
+
+
+def _route(path):
+    """Collapses names out of an API path, e.g. /api/v1/namespaces/{ns}/pods/{name}/log."""
+    parts = path.strip('/').split('/')
+    version = 2 if parts[0] == 'api' else 3
+    rest = parts[version:]
+    resource_at = 0
+    if len(rest) > 2 and rest[0] == 'namespaces':
+        rest[1] = '{ns}'
+        resource_at = 2
+    if len(rest) > resource_at + 1:
+        rest[resource_at + 1] = '{name}'
+    return '/' + '/'.join(parts[:version] + rest)
+
+
+def instrument_api_client(api_client):
+    """Wraps the REST client of `api_client` so every non-watch request is recorded as an API span."""
+    rest = api_client.rest_client
+    request = rest.request
+
+    def traced_request(method, url, query_params=None, **kwargs):
+        if query_params and any(key == 'watch' and value for key, value in query_params):
+            return request(method, url, query_params=query_params, **kwargs)
+        with tracer.span(API, f"{method} {_route(urlsplit(url).path)}") as span:
+            response = request(method, url, query_params=query_params, **kwargs)
+            if kwargs.get('_preload_content', True):
+                size = len(response.data or b'')
+            else:
+                # Streamed body: only the announced length is known.
+                size = int(response.getheader('Content-Length') or 0)
+            span.set(status=str(response.status), bytes=size)
+            tracer.count_parent(HANDLER, 'api_calls')
+            tracer.count_parent(HANDLER, 'api_bytes', size)
+            return response
+
+    rest.request = traced_request
+
+
+tracer = Tracer(trace_file=os.getenv('MCP_TRACE_FILE'))
@@ -1,14 +1,87 @@
+import importlib
+import os
+import threading
 from dotenv import load_dotenv
-from agent import Agent
-
-def main():
-    load_dotenv()
 
+def _warm_up():
+    """Imports the agent stack (google.genai, kubernetes) in the background while the prompt is shown."""
     try:
-        mcp_agent = Agent()
-    except RuntimeError as e:
-        print(e)
+        importlib.import_module('agent')
+    except Exception:
+        pass  # Reported by the first real command.
+
+def _create_agent():
+    # Waits on the import lock if the warm-up thread is still importing.
+    from agent import Agent
+    return Agent()
+
+def _fast_path(user_input, mcp_agent):
+    """Answers simple read commands locally; returns False to hand the input to the agent."""
+    if mcp_agent is not None and mcp_agent.pending_action:
+        return False
+    from intents import ENABLED, intent_router
+    if not ENABLED:
+        return False
+    reply = intent_router.route(user_input)
+    if reply is None:
+        return False
+    print(reply)
+    if mcp_agent is not None:
+        mcp_agent.remember(user_input, reply)
+    return True
+
+def print_stats(args):
+    """'stats' shows the collected metrics; 'stats prom' prints them in the Prometheus text format."""
+    from k8s.cache import result_cache
+    from k8s.tracing import tracer
+    if args == 'prom':
+        print(tracer.prometheus_text(), end='')
         return
+    print(tracer.summary())
+    cache = result_cache.stats()
+    print(f"Cache des résultats: {cache['entries']} entrées, {cache['hits']} hits / {cache['misses']} miss "
+          f"({cache['hit_rate']:.0%}), {cache['invalidations']} invalidations")
+    from intents import intent_router
+    intents = intent_router.stats()
+    print(f"Routage direct (sans LLM): {intents['hits']}/{intents['hits'] + intents['misses']} commandes "
+          f"({intents['hit_rate']:.0%})")
+    for intent, count in intents['by_intent'].items():
+        print(f"  {intent}: {count}")
+    if intents['recent_misses']:
+        print("  Dernières commandes transmises à l'agent:")
+        for text in intents['recent_misses'][-5:]:
+            print(f"    - {text}")
+
+def export_metrics(path):
+    """Rewrites `path` with the current metrics (Prometheus text, e.g. for a node_exporter textfile collector)."""
+    from k8s.tracing import tracer
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w') as f:
+        f.write(tracer.prometheus_text())
+    os.replace(tmp, path)
+
+def render_stream(events):
+    """Prints agent events as they arrive."""
+    at_line_start = True
+    for kind, payload in events:
+        if kind == 'tool_call':
+            if not at_line_start:
+                print()
+            target = payload.get('name') or payload.get('application_name') or payload.get('namespace') or ''
+            print(f"[outil] {payload.get('verb')} {payload.get('resource')} {target}".rstrip(), flush=True)
+            at_line_start = True
+        else:
+            print(payload, end='', flush=True)
+            at_line_start = payload.endswith('\n')
+    if not at_line_start:
+        print()
+
+def main():
+    load_dotenv()
+    streaming = os.getenv('MCP_STREAMING', '1') != '0'
+    metrics_file = os.getenv('MCP_METRICS_FILE')
+    threading.Thread(target=_warm_up, daemon=True).start()
+    mcp_agent = None
 
     print("MCP Core Initialisé. Tapez 'help' ou 'exit'.")
 
@@ -27,12 +100,33 @@ def main():
             break
 
         if user_input.lower() == 'help':
-            print("Commandes: 'exit', 'help'.")
+            print("Commandes: 'exit', 'help', 'stats' (latences LLM/outils/API), 'stats prom'.")
             print("Exemples: 'quel est le statut des nœuds ?', 'liste les pods dans kube-system', 'décris le pod coredns'")
             continue
 
-        response_text = mcp_agent.execute_turn(user_input)
-        print(response_text)
+        command, _, args = user_input.lower().partition(' ')
+        if command == 'stats':
+            print_stats(args.strip())
+            continue
+
+        if _fast_path(user_input, mcp_agent):
+            continue
+
+        if mcp_agent is None:
+            try:
+                mcp_agent = _create_agent()
+            except RuntimeError as e:
+                print(e)
+                return
+
+        if streaming:
+            render_stream(mcp_agent.stream_turn(user_input))
+        else:
+            print(mcp_agent.execute_turn(user_input))
+        if mcp_agent.tokens_saved:
+            print(f"(historique compacté : {mcp_agent.tokens_saved} tokens économisés)")
+        if metrics_file:
+            export_metrics(metrics_file)
 
 if __name__ == "__main__":
     main()
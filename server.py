@@ -0,0 +1,227 @@
+"""Multi-session HTTP mode: one shared MCP instance for several users.
+
+Each session owns its Agent (history, pending confirmation); turns of one
+session are serialized, turns of different sessions run concurrently. Agent
+turns run in a thread pool and all sessions share one pool for the blocking
+Kubernetes calls, so a slow log fetch only holds one worker.
+
+    POST   /sessions                  -> 201 {"session": id}
+    POST   /sessions/<id>/messages    {"message": "..."} -> {"reply": "...", "pending_confirmation": bool}
+    GET    /sessions                  -> sessions with their history size
+    DELETE /sessions/<id>             -> 204
+    GET    /metrics                   -> Prometheus text metrics
+
+Usage: python server.py [--host 127.0.0.1] [--port 8765]
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+
+# Before the imports below: they read KUBECONFIG and the MCP_* settings at import time.
+load_dotenv()
+
+from agent import Agent, create_genai_client
+from intents import ENABLED as FAST_PATH_ENABLED, intent_router
+from k8s.tracing import tracer
+
+MAX_SESSIONS = int(os.getenv('MCP_SERVER_MAX_SESSIONS', '50'))
+# Seconds without a message after which a session is dropped.
+SESSION_IDLE_TIMEOUT = float(os.getenv('MCP_SESSION_IDLE_TIMEOUT', '1800'))
+# History budget (estimated tokens) of each session; compaction keeps it under this cap.
+SESSION_TOKEN_BUDGET = int(os.getenv('MCP_SESSION_TOKEN_BUDGET', '16000'))
+TURN_WORKERS = int(os.getenv('MCP_SERVER_TURN_WORKERS', '16'))
+TOOL_WORKERS = int(os.getenv('MCP_SERVER_TOOL_WORKERS', '32'))
+MAX_BODY_BYTES = 1 << 20
+
+REASONS = {200: 'OK', 201: 'Created', 204: 'No Content', 400: 'Bad Request', 404: 'Not Found',
+           405: 'Method Not Allowed', 413: 'Payload Too Large', 500: 'Internal Server Error', 503: 'Service Unavailable'}
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class Session:
+    def __init__(self, agent):
+        self.id = uuid.uuid4().hex
+        self.agent = agent
+        self.lock = asyncio.Lock()
+        self.created = time.time()
+        self.last_used = time.monotonic()
+
+    def info(self):
+        return {
+            'session': self.id, 'created': self.created,
+            'idle_seconds': round(time.monotonic() - self.last_used, 1),
+            'history_tokens': self.agent.chat_history.token_count(),
+            'pending_confirmation': self.agent.pending_action is not None,
+        }
+
+
+class SessionServer:
+    """Routes HTTP requests to per-session agents."""
+
+    def __init__(self, max_sessions=MAX_SESSIONS, token_budget=SESSION_TOKEN_BUDGET):
+        self.max_sessions = max_sessions
+        self.token_budget = token_budget
+        self.sessions = {}
+        self.turn_pool = ThreadPoolExecutor(max_workers=TURN_WORKERS, thread_name_prefix='mcp-turn')
+        # Kept separate from turn_pool: turns block on their tool calls.
+        self.tool_pool = ThreadPoolExecutor(max_workers=TOOL_WORKERS, thread_name_prefix='mcp-tool')
+        try:
+            self.genai_client = create_genai_client()
+        except Exception as e:
+            raise RuntimeError(f"Impossible d'initialiser le client Google GenAI: {e}")
+
+    def _evict_idle(self):
+        now = time.monotonic()
+        for session_id, session in list(self.sessions.items()):
+            if now - session.last_used > SESSION_IDLE_TIMEOUT and not session.lock.locked():
+                del self.sessions[session_id]
+
+    def _session(self, session_id):
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise HttpError(404, f"Session '{session_id}' inconnue ou expirée.")
+        return session
+
+    async def create_session(self):
+        self._evict_idle()
+        if len(self.sessions) >= self.max_sessions:
+            raise HttpError(503, f"Nombre maximal de sessions atteint ({self.max_sessions}).")
+        agent = Agent(history_token_budget=self.token_budget, client=self.genai_client, tool_pool=self.tool_pool)
+        session = Session(agent)
+        self.sessions[session.id] = session
+        return 201, {'session': session.id}
+
+    async def send_message(self, session_id, body):
+        session = self._session(session_id)
+        message = body.get('message') if isinstance(body, dict) else None
+        if not isinstance(message, str) or not message.strip():
+            raise HttpError(400, "Champ 'message' manquant.")
+        async with session.lock:
+            session.last_used = time.monotonic()
+            loop = asyncio.get_running_loop()
+            reply = await loop.run_in_executor(self.turn_pool, self._turn, session.agent, message.strip())
+            session.last_used = time.monotonic()
+        return 200, {'reply': reply, 'pending_confirmation': session.agent.pending_action is not None}
+
+    @staticmethod
+    def _turn(agent, message):
+        if FAST_PATH_ENABLED and not agent.pending_action:
+            reply = intent_router.route(message)
+            if reply is not None:
+                agent.remember(message, reply)
+                return reply
+        return agent.execute_turn(message)
+
+    async def handle(self, method, path, body):
+        parts = [part for part in path.split('?')[0].split('/') if part]
+        if parts == ['metrics'] and method == 'GET':
+            return 200, tracer.prometheus_text()
+        if parts == ['sessions']:
+            if method == 'POST':
+                return await self.create_session()
+            if method == 'GET':
+                self._evict_idle()
+                return 200, {'sessions': [session.info() for session in self.sessions.values()]}
+        elif len(parts) == 2 and parts[0] == 'sessions' and method == 'DELETE':
+            self._session(parts[1])
+            del self.sessions[parts[1]]
+            return 204, None
+        elif len(parts) == 3 and parts[0] == 'sessions' and parts[2] == 'messages' and method == 'POST':
+            return await self.send_message(parts[1], body)
+        else:
+            raise HttpError(404, f"Chemin inconnu: {path}")
+        raise HttpError(405, f"Méthode {method} non supportée pour {path}")
+
+    async def serve_connection(self, reader, writer):
+        """Minimal HTTP/1.1 with keep-alive; bodies are JSON."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode('latin-1').split(' ', 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    key, _, value = line.decode('latin-1').partition(':')
+                    headers[key.strip().lower()] = value.strip()
+
+                try:
+                    length = int(headers.get('content-length') or 0)
+                    if length > MAX_BODY_BYTES:
+                        raise HttpError(413, "Requête trop volumineuse.")
+                    raw = await reader.readexactly(length) if length else b''
+                    try:
+                        body = json.loads(raw) if raw else None
+                    except ValueError:
+                        raise HttpError(400, "Corps JSON invalide.")
+                    status, payload = await self.handle(method, path, body)
+                except HttpError as e:
+                    status, payload = e.status, {'error': str(e)}
+                except Exception as e:
+                    status, payload = 500, {'error': f"Une erreur inattendue est survenue: {e}"}
+
+                await self._respond(writer, status, payload)
+                if headers.get('connection', '').lower() == 'close' or status == 413:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _respond(writer, status, payload):
+        if payload is None:
+            data, content_type = b'', 'application/json'
+        elif isinstance(payload, str):
+            data, content_type = payload.encode(), 'text/plain; version=0.0.4'
+        else:
+            data, content_type = json.dumps(payload, ensure_ascii=False).encode(), 'application/json; charset=utf-8'
+        head = (f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\nContent-Type: {content_type}\r\n"
+                f"Content-Length: {len(data)}\r\n\r\n")
+        writer.write(head.encode('latin-1') + data)
+        await writer.drain()
+
+    def close(self):
+        self.turn_pool.shutdown(wait=False, cancel_futures=True)
+        self.tool_pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def serve(host, port):
+    sessions = SessionServer()
+    server = await asyncio.start_server(sessions.serve_connection, host, port)
+    print(f"MCP serveur multi-sessions sur http://{host}:{server.sockets[0].getsockname()[1]}", flush=True)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        sessions.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serveur MCP multi-sessions")
+    parser.add_argument('--host', default=os.getenv('MCP_SERVER_HOST', '127.0.0.1'))
+    parser.add_argument('--port', type=int, default=int(os.getenv('MCP_SERVER_PORT', '8765')))
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except RuntimeError as e:
+        print(e)
+    except KeyboardInterrupt:
+        print("\nArrêt.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from k8s import client, router
+from k8s.cache import ResultCache
+
+
+def test_entries_expire_after_their_verbs_ttl():
+    cache = ResultCache(ttls={'get': 0.05})
+    key = cache.key('get', 'pods', namespace='a')
+    cache.put(key, 'pods')
+    assert cache.get(key) == 'pods'
+    time.sleep(0.06)
+    assert cache.get(key) is None
+
+    uncached = cache.key('restart', 'deployments', namespace='a')
+    cache.put(uncached, 'restarted')
+    assert cache.get(uncached) is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResultCache(max_entries=2, ttls={'get': 60})
+    a, b, c = (cache.key('get', 'pods', namespace=ns) for ns in 'abc')
+    cache.put(a, 'a')
+    cache.put(b, 'b')
+    cache.get(a)
+    cache.put(c, 'c')
+    assert cache.get(b) is None
+    assert (cache.get(a), cache.get(c)) == ('a', 'c')
+
+
+def test_invalidation_drops_the_namespace_and_cluster_wide_entries_of_one_cluster():
+    cache = ResultCache(ttls={'get': 60})
+    keys = {
+        'a': cache.key('get', 'pods', namespace='a', cluster='c1'),
+        'b': cache.key('get', 'pods', namespace='b', cluster='c1'),
+        'all': cache.key('get', 'pods', cluster='c1'),
+        'other cluster': cache.key('get', 'pods', namespace='a', cluster='c2'),
+    }
+    for label, key in keys.items():
+        cache.put(key, label)
+
+    cache.invalidate('a', cluster='c1')
+    assert [label for label, key in keys.items() if cache.get(key)] == ['b', 'other cluster']
+
+    cache.invalidate(None, cluster='c1')
+    assert [label for label, key in keys.items() if cache.get(key)] == ['other cluster']
+
+
+@pytest.fixture
+def run(monkeypatch):
+    """Runs tool calls on one fake cluster; every dispatch answers with a fresh result."""
+    cache = ResultCache(ttls={'get': 60})
+    calls = []
+
+    def dispatch(verb, resource, **kwargs):
+        calls.append(verb)
+        return f"{verb} #{len(calls)}"
+
+    monkeypatch.setattr(client, 'result_cache', cache)
+    monkeypatch.setattr(client, 'RESULT_CACHE_ENABLED', True)
+    monkeypatch.setattr(router, 'dispatch', dispatch)
+
+    def run(verb, context='c1', **tool_args):
+        clusters = SimpleNamespace(error=None, context=context, v1=None, apps_v1=None, informers=None, fast_read=False)
+        return client._run_on(clusters, verb, 'pods', tool_args)
+    return run
+
+
+def test_reads_are_served_from_the_cache_until_a_mutation_in_their_namespace(run):
+    assert run('get', namespace='a') == 'get #1'
+    assert run('get', namespace='b') == 'get #2'
+    assert run('get', namespace='a') == 'get #1'
+
+    run('restart', namespace='a')
+    assert run('get', namespace='a') == 'get #4'
+    assert run('get', namespace='b') == 'get #2'
+
+
+def test_mutation_without_a_namespace_invalidates_the_whole_cluster(run):
+    run('get', namespace='a')
+    run('get', namespace='a', context='c2')
+    run('apply')
+    assert run('get', namespace='a') == 'get #4'
+    assert run('get', namespace='a', context='c2') == 'get #2'
+
+
+def test_mutation_on_a_namespace_set_invalidates_the_whole_cluster(run):
+    run('get', namespace='c')
+    run('restart', namespace='a,b', label_selector='app=web')
+    assert run('get', namespace='c') == 'get #3'
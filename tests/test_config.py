@@ -0,0 +1,29 @@
+from k8s import config
+from k8s.config import k8s_clients
+
+
+class FakeClusterClients:
+    error = None
+
+    def __init__(self):
+        self.users = 0
+        self.last_used = 0
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def test_clusters_in_use_are_not_evicted(monkeypatch):
+    monkeypatch.setattr(config, 'IDLE_TIMEOUT', 0)
+    monkeypatch.setattr(k8s_clients, '_clusters', {'busy': FakeClusterClients(), 'other': FakeClusterClients()})
+
+    with k8s_clients.use('busy') as busy:
+        k8s_clients.get('other')
+        k8s_clients._evict_idle(keep='other')
+        assert not busy.closed
+        assert 'busy' in k8s_clients._clusters
+
+    k8s_clients._evict_idle(keep='other')
+    assert busy.closed
+    assert 'busy' not in k8s_clients._clusters
@@ -0,0 +1,40 @@
+from types import SimpleNamespace
+
+from k8s.health import POD, HealthMonitor
+
+
+def pod(phase='Running', restarts=0):
+    status = SimpleNamespace(state=None, restart_count=restarts)
+    return SimpleNamespace(status=SimpleNamespace(phase=phase, container_statuses=[status]))
+
+
+def test_changes_since_reports_new_changed_and_resolved_problems():
+    monitor = HealthMonitor()
+    monitor.update(POD, ('ns', 'a'), pod('Pending'))
+    monitor.update(POD, ('ns', 'b'), pod('Failed'))
+    token, _ = monitor.snapshot()
+
+    monitor.update(POD, ('ns', 'a'), pod('Running'))
+    monitor.update(POD, ('ns', 'b'), pod('Failed', restarts=9))
+    monitor.update(POD, ('ns', 'c'), pod('Pending'))
+    _, changes = monitor.changes_since(token)
+
+    assert changes == {
+        (POD, 'ns', 'a'): ("en état 'Pending'", None),
+        (POD, 'ns', 'b'): ("en état 'Failed'", "en état 'Failed', 9 redémarrages"),
+        (POD, 'ns', 'c'): (None, "en état 'Pending'"),
+    }
+
+
+def test_token_of_a_previous_monitor_is_rejected():
+    old = HealthMonitor()
+    for i in range(5):
+        old.update(POD, ('ns', f'p{i}'), pod('Pending'))
+    token, _ = old.snapshot()
+
+    new = HealthMonitor()
+    for i in range(10):
+        new.update(POD, ('ns', f'p{i}'), pod('Pending'))
+    assert new.changes_since(token)[1] is None
+    assert new.changes_since('3')[1] is None
+    assert new.changes_since(new.snapshot()[0])[1] == {}
@@ -0,0 +1,66 @@
+from google.genai import types
+
+from history import ChatHistory
+
+
+def text(role, message):
+    return types.Content(role=role, parts=[types.Part.from_text(text=message)])
+
+
+def add_turn(history, i, result_chars=4000):
+    history.append(text('user', f"question {i}"))
+    history.append(types.Content(role='model', parts=[types.Part(function_call=types.FunctionCall(
+        id=f"call-{i}", name='kubernetes_tool', args={'verb': 'get', 'resource': 'pods'}))]))
+    history.append(types.Content(role='user', parts=[types.Part(function_response=types.FunctionResponse(
+        id=f"call-{i}", name='kubernetes_tool', response={'result': "pod ligne\n" * (result_chars // 10)}))]))
+    history.append(text('model', f"réponse {i}"))
+
+
+def call_ids(contents):
+    calls = [part.function_call.id for content in contents for part in content.parts if part.function_call]
+    responses = [part.function_response.id for content in contents for part in content.parts if part.function_response]
+    return calls, responses
+
+
+def make_history(token_budget, turns=6):
+    preamble = [text('user', "Tu es un assistant Kubernetes."), text('model', "Compris.")]
+    history = ChatHistory(preamble, token_budget=token_budget, keep_recent_turns=2)
+    for i in range(turns):
+        add_turn(history, i)
+    return history, preamble
+
+
+def test_compaction_stubs_old_results_and_keeps_recent_turns_verbatim():
+    history, preamble = make_history(token_budget=2500)
+    recent = [list(turn) for turn in history.turns[-2:]]
+    before = history.token_count()
+
+    saved = history.compact()
+
+    assert saved == before - history.token_count() > 0
+    assert history.token_count() <= 2500
+    assert len(history.turns) == 6  # Stubbing was enough: no turn dropped.
+    assert history.contents[:2] == preamble
+    assert history.turns[-2:] == recent
+    assert all(len(part.function_response.response['result']) < 300
+               for turn in history.turns[:-2] for content in turn for part in content.parts
+               if part.function_response)
+    calls, responses = call_ids(history.contents)
+    assert calls == responses
+
+
+def test_compaction_drops_whole_old_turns_when_stubs_are_not_enough():
+    history, preamble = make_history(token_budget=2500, turns=12)
+    recent = [list(turn) for turn in history.turns[-2:]]
+    before = history.token_count()
+
+    saved = history.compact()
+
+    assert saved == before - history.token_count()
+    assert history.token_count() <= 2500
+    assert 2 <= len(history.turns) < 12
+    assert history.contents[:2] == preamble
+    assert history.turns[-2:] == recent
+    assert history.turns[0][0].parts[0].text.startswith('question')
+    calls, responses = call_ids(history.contents)
+    assert calls == responses
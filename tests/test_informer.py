@@ -0,0 +1,210 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+from kubernetes import client
+
+from k8s import informer as informer_module
+from k8s.informer import CachedAppsV1Api, CachedCoreV1Api, Informer, InformerCache
+
+WATCH_ONCE = Informer._watch_once
+
+
+def pod(name, namespace='default'):
+    return SimpleNamespace(metadata=SimpleNamespace(name=name, namespace=namespace, resource_version='1'))
+
+
+def page(*items):
+    return SimpleNamespace(items=list(items), metadata=SimpleNamespace(resource_version='1'))
+
+
+class FakeCoreV1Api:
+    """Answers lists with `pods`, or raises `error` when set."""
+
+    def __init__(self, pods=(), error=None):
+        self.pods = list(pods)
+        self.error = error
+        self.calls = 0
+
+    def _list(self, *args, **kwargs):
+        self.calls += 1
+        if self.error:
+            raise self.error
+        return page(*self.pods)
+
+    list_pod_for_all_namespaces = list_namespaced_pod = list_node = list_namespace = _list
+
+
+class FakeAppsV1Api:
+    def _list(self, *args, **kwargs):
+        return page()
+
+    list_deployment_for_all_namespaces = list_replica_set_for_all_namespaces = _list
+
+
+@pytest.fixture(autouse=True)
+def idle_watch(monkeypatch):
+    """Replaces the watch by a wait for stop(), so tests never open a connection."""
+    monkeypatch.setattr(Informer, '_watch_once', lambda self: self._stopped.wait())
+
+
+def make_cache(v1, sync_timeout=30):
+    return InformerCache(v1, FakeAppsV1Api(), sync_timeout=sync_timeout)
+
+
+def test_synced_informer_serves_reads():
+    v1 = FakeCoreV1Api(pods=[pod('a'), pod('b')])
+    cache = make_cache(v1)
+    try:
+        api = CachedCoreV1Api(v1, cache)
+        assert [p.metadata.name for p in api.list_namespaced_pod('default').items] == ['a', 'b']
+        assert v1.calls == 1  # The informer's list only.
+    finally:
+        cache.stop()
+
+
+def test_failed_first_list_falls_back_without_waiting():
+    v1 = FakeCoreV1Api(error=RuntimeError('forbidden'))
+    cache = make_cache(v1, sync_timeout=30)
+    try:
+        start = time.monotonic()
+        assert cache.informer('pods') is None
+        assert cache.informer('pods') is None
+        assert time.monotonic() - start < 5
+
+        v1.error = None
+        v1.pods = [pod('direct')]
+        api = CachedCoreV1Api(v1, cache)
+        assert [p.metadata.name for p in api.list_namespaced_pod('default').items] == ['direct']
+    finally:
+        cache.stop()
+
+
+def test_informer_failing_after_sync_is_skipped_at_once():
+    v1 = FakeCoreV1Api(pods=[pod('a')])
+    cache = make_cache(v1, sync_timeout=30)
+    try:
+        informer = cache.informer('pods')
+        assert informer is not None
+
+        threading.Thread(target=informer._fail, args=(RuntimeError('watch dropped'),), daemon=True).start()
+        while informer.has_synced:
+            time.sleep(0.01)
+        start = time.monotonic()
+        assert cache.informer('pods') is None
+        assert time.monotonic() - start < 1
+    finally:
+        cache.stop()
+
+
+def test_slow_first_list_is_waited_for_once():
+    release = threading.Event()
+    v1 = FakeCoreV1Api(pods=[pod('a')])
+    original = v1._list
+
+    def slow_list(*args, **kwargs):
+        release.wait()
+        return original(*args, **kwargs)
+
+    v1.list_pod_for_all_namespaces = slow_list
+    cache = make_cache(v1, sync_timeout=0.2)
+    try:
+        start = time.monotonic()
+        assert cache.informer('pods') is None
+        assert cache.informer('pods') is None
+        assert time.monotonic() - start < 1  # The second call does not wait again.
+
+        release.set()
+        assert cache._informers['pods'].wait_for_sync(5)
+        assert cache.informer('pods') is not None
+    finally:
+        release.set()
+        cache.stop()
+
+
+def test_health_monitor_shares_one_sync_wait():
+    release = threading.Event()
+    v1 = FakeCoreV1Api()
+
+    def slow_list(*args, **kwargs):
+        release.wait()
+        return page()
+
+    v1.list_node = v1.list_pod_for_all_namespaces = slow_list
+    cache = make_cache(v1, sync_timeout=0.3)
+    try:
+        start = time.monotonic()
+        assert cache.health() is None
+        assert time.monotonic() - start < 0.6
+    finally:
+        release.set()
+        cache.stop()
+
+
+def test_field_selector_on_a_field_the_resource_lacks_goes_to_the_api():
+    class Apps(FakeAppsV1Api):
+        def list_deployment_for_all_namespaces(self, *args, **kwargs):
+            self.direct = kwargs
+            return page(pod('web'))  # No status.phase, as on a real deployment.
+
+    apps = Apps()
+    cache = InformerCache(FakeCoreV1Api(), apps, sync_timeout=5)
+    try:
+        api = CachedAppsV1Api(apps, cache)
+        api.list_deployment_for_all_namespaces(field_selector='status.phase=Running')
+        assert apps.direct == {'field_selector': 'status.phase=Running'}
+    finally:
+        cache.stop()
+
+
+class SilentWatchHandler(BaseHTTPRequestHandler):
+    """Answers pod lists, then accepts watches without ever sending an event (a half-open connection)."""
+
+    lists = 0
+
+    def do_GET(self):
+        if 'watch=true' in self.path.lower():
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            self.server.hang.wait()
+            return
+        type(self).lists += 1
+        body = json.dumps({'kind': 'PodList', 'apiVersion': 'v1', 'metadata': {'resourceVersion': '1'}, 'items': []})
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body.encode())
+
+    def log_message(self, *args):
+        pass
+
+
+def test_silent_watch_times_out_and_relists(monkeypatch):
+    monkeypatch.setattr(Informer, '_watch_once', WATCH_ONCE)
+    monkeypatch.setattr(informer_module, 'WATCH_READ_SLACK', 0)
+    monkeypatch.setattr(SilentWatchHandler, 'lists', 0)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SilentWatchHandler)
+    server.hang = threading.Event()
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    configuration = client.Configuration()
+    configuration.host = f'http://127.0.0.1:{server.server_port}'
+    v1 = client.CoreV1Api(client.ApiClient(configuration))
+    informer = Informer(v1.list_pod_for_all_namespaces, watch_timeout=1, retry_delay=0.1)
+    try:
+        informer.start()
+        assert informer.wait_for_sync(5)
+        deadline = time.monotonic() + 10
+        while SilentWatchHandler.lists < 2 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert SilentWatchHandler.lists >= 2  # The read timeout ended the watch and forced a relist.
+    finally:
+        informer.stop()
+        server.hang.set()
+        server.shutdown()
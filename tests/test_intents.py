@@ -0,0 +1,16 @@
+from intents import parse
+
+
+def test_label_selector_keeps_its_case():
+    intent = parse("list pods with label app=MyApp")
+    assert (intent.verb, intent.resource, intent.args) == ('get', 'pods', {'label_selector': 'app=MyApp'})
+
+
+def test_keywords_are_case_and_accent_insensitive():
+    intent = parse("Décris le Déploiement coredns dans kube-system")
+    assert (intent.verb, intent.resource, intent.args) == (
+        'describe', 'deployments', {'name': 'coredns', 'namespace': 'kube-system'})
+
+
+def test_cluster_name_keeps_its_case():
+    assert parse("Montre les pods du cluster Prod-EU").args == {'cluster': 'Prod-EU'}
@@ -0,0 +1,142 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+from kubernetes.client.rest import ApiException
+
+from k8s import resilience
+from k8s.resilience import (REQUEST_TIMEOUT, CircuitBreaker, CircuitOpenError, api_transient, call, deadline,
+                            install_policy, remaining, with_current_deadline)
+
+
+def api_error(status):
+    return ApiException(status=status, reason='test')
+
+
+class Flaky:
+    """Raises `errors` one per call, then returns 'ok'."""
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return 'ok'
+
+
+class FakeRest:
+    """Stands in for the REST client: records each request's timeout, answers through `flaky`."""
+
+    def __init__(self, *errors):
+        self.pool_manager = SimpleNamespace(connection_pool_kw={})
+        self.flaky = Flaky(*errors)
+        self.timeouts = []
+
+    def request(self, method, url, query_params=None, _request_timeout=None, **kwargs):
+        self.timeouts.append(_request_timeout)
+        return self.flaky()
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(resilience, 'backoff', lambda attempt: 0.01)
+
+
+def test_pool_workers_run_under_the_submitting_threads_deadline():
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        assert pool.submit(with_current_deadline(remaining)).result() is None
+        with deadline(5):
+            left = pool.submit(with_current_deadline(remaining)).result()
+        assert 0 < left <= 5
+        # The worker thread does not keep the deadline afterwards.
+        assert pool.submit(remaining).result() is None
+
+
+def test_breaker_opens_after_threshold_then_half_opens_and_closes():
+    breaker = CircuitBreaker('test', threshold=2, cooldown=0.1)
+    for _ in range(2):
+        with pytest.raises(ApiException):
+            call(Flaky(*[api_error(503)] * 3), api_transient, breaker)
+    assert breaker.state == 'open'
+    func = Flaky()
+    with pytest.raises(CircuitOpenError):
+        call(func, api_transient, breaker)
+    assert func.calls == 0
+
+    time.sleep(0.1)
+    assert breaker.state == 'half-open'
+    assert call(func, api_transient, breaker) == 'ok'
+    assert breaker.state == 'closed'
+
+
+def test_failed_half_open_trial_reopens_the_circuit():
+    breaker = CircuitBreaker('test', threshold=1, cooldown=0.1)
+    with pytest.raises(ApiException):
+        call(Flaky(*[api_error(503)] * 3), api_transient, breaker)
+    time.sleep(0.1)
+    with pytest.raises(ApiException):
+        call(Flaky(*[api_error(503)] * 3), api_transient, breaker)
+    assert breaker.state == 'open'
+
+
+def test_permanent_errors_are_not_retried_nor_counted():
+    breaker = CircuitBreaker('test', threshold=1)
+    func = Flaky(api_error(404))
+    with pytest.raises(ApiException):
+        call(func, api_transient, breaker)
+    assert func.calls == 1
+    assert breaker.state == 'closed' and breaker.failures == 0
+
+
+def test_transient_errors_are_retried_until_attempts_run_out():
+    func = Flaky(api_error(503), api_error(429))
+    assert call(func, api_transient, attempts=3) == 'ok'
+    assert func.calls == 3
+
+    func = Flaky(*[api_error(503)] * 3)
+    with pytest.raises(ApiException):
+        call(func, api_transient, attempts=3)
+    assert func.calls == 3
+
+
+def test_retries_stop_when_the_deadline_runs_out(monkeypatch):
+    monkeypatch.setattr(resilience, 'backoff', lambda attempt: 0.5)
+    func = Flaky(*[api_error(503)] * 3)
+    with deadline(0.3), pytest.raises(ApiException):
+        call(func, api_transient, attempts=3)
+    assert func.calls == 1  # The backoff would outlive the deadline.
+
+    with deadline(0), pytest.raises(resilience.DeadlineExceeded):
+        call(Flaky(), api_transient)
+
+
+def test_request_timeout_is_clamped_to_the_deadline():
+    rest = FakeRest()
+    install_policy(SimpleNamespace(rest_client=rest), CircuitBreaker('test'))
+    assert rest.pool_manager.connection_pool_kw['retries'] == 0
+
+    rest.request('GET', '/api/v1/pods')
+    with deadline(2):
+        rest.request('GET', '/api/v1/pods')
+    assert rest.timeouts[0] == (REQUEST_TIMEOUT, REQUEST_TIMEOUT)
+    connect, read = rest.timeouts[1]
+    assert isinstance(rest.timeouts[1], tuple) and 1.5 < connect == read <= 2
+
+
+def test_policy_retries_reads_only_and_leaves_watches_alone():
+    rest = FakeRest(api_error(503))
+    install_policy(SimpleNamespace(rest_client=rest), CircuitBreaker('test'))
+    assert rest.request('GET', '/api/v1/pods') == 'ok'
+    assert rest.flaky.calls == 2
+
+    rest.flaky.errors = [api_error(503)]
+    with pytest.raises(ApiException):
+        rest.request('POST', '/api/v1/pods')
+    assert rest.flaky.calls == 3
+
+    rest.request('GET', '/api/v1/pods', query_params=[('watch', True)], _request_timeout=None)
+    assert rest.timeouts[-1] is None
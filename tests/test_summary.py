@@ -0,0 +1,29 @@
+from types import SimpleNamespace
+
+from k8s.summary import Collector, PodSummary
+
+
+def pod(name):
+    status = SimpleNamespace(ready=True, restart_count=0)
+    return SimpleNamespace(metadata=SimpleNamespace(name=name, namespace='default'),
+                           spec=SimpleNamespace(containers=[None]),
+                           status=SimpleNamespace(phase='Running', container_statuses=[status]))
+
+
+def test_lines_are_only_built_until_the_collector_summarizes():
+    built = []
+
+    def line(item):
+        built.append(item.metadata.name)
+        return f"- {item.metadata.name}\n"
+
+    pods = Collector(PodSummary(), max_objects=3)
+    for i in range(10):
+        pods.add(pod(f"p{i}"), line)
+    assert pods.summarized
+    assert pods.summary.total == 10
+    assert built == ['p0', 'p1', 'p2', 'p3']
+
+    pods = Collector(PodSummary(), output='summary')
+    pods.add(pod('p0'), line)
+    assert len(built) == 4
@@ -0,0 +1,55 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from k8s.tracing import API, HANDLER, LLM, Tracer
+
+
+def test_prometheus_text_declares_every_family_and_keeps_latencies_out_of_counters():
+    tracer = Tracer()
+    for first_chunk_ms in (120, 80):
+        with tracer.span(LLM, 'gemini') as span:
+            span.set(first_chunk_ms=first_chunk_ms, prompt_tokens=10)
+    lines = tracer.prometheus_text().splitlines()
+
+    assert 'mcp_span_first_chunk_seconds_sum{kind="llm",name="gemini"} 0.200000' in lines
+    assert 'mcp_span_first_chunk_seconds_count{kind="llm",name="gemini"} 2' in lines
+    assert not any(line.startswith('mcp_span_first_chunk_ms') for line in lines)
+    assert 'mcp_span_prompt_tokens_total{kind="llm",name="gemini"} 20' in lines
+
+    declared = {line.split()[2] for line in lines if line.startswith('# TYPE')}
+    samples = {line.split('{')[0].split()[0] for line in lines if not line.startswith('#')}
+    assert all(any(sample == f or sample in (f + '_sum', f + '_count') for f in declared) for sample in samples)
+
+
+def test_api_calls_of_pool_workers_count_on_the_submitting_handler_span():
+    tracer = Tracer()
+
+    def request(i):
+        with tracer.span(API, 'GET /api/v1/namespaces/{ns}/pods/{name}/log'):
+            tracer.count_parent(HANDLER, 'api_calls')
+
+    tracer.start_turn()
+    with ThreadPoolExecutor(max_workers=4) as pool, tracer.span(HANDLER, 'logs deployments') as handler:
+        list(pool.map(tracer.bind(request), range(20)))
+    assert handler.attrs['api_calls'] == 20
+    assert {span.turn for span in tracer.turn_spans()} == {handler.turn}
+
+
+def test_turns_of_concurrent_sessions_do_not_mix():
+    tracer = Tracer()
+    turns, ready = {}, threading.Barrier(2)
+
+    def session(name):
+        turns[name] = tracer.start_turn()
+        ready.wait()
+        with tracer.span(LLM, name):
+            pass
+
+    threads = [threading.Thread(target=session, args=(name,)) for name in ('a', 'b')]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert turns['a'] != turns['b']
+    assert [span.name for span in tracer.turn_spans(turns['a'])] == ['a']
+    assert [span.name for span in tracer.turn_spans(turns['b'])] == ['b']